@@ -3,7 +3,10 @@ from typing import Optional
 from Player import Player
 from Board import Board
 from enum import Enum, auto
-from Chess.Piece import Color
+from Chess.Piece import Color, KNIGHT, BISHOP, ROOK, QUEEN
+
+# promotion piece by the letter that may follow a move (e.g. 'e7 e8 n'); without a letter pawns promote to a queen
+PROMOTION_LETTERS: dict[str, int] = {"q": QUEEN, "r": ROOK, "b": BISHOP, "n": KNIGHT}
 
 
 class State(Enum):
@@ -25,11 +28,14 @@ def main():
     state: State = State.SETUP
 
     game_over: bool = False
-    board: Board = Board(True)
+    board: Board = Board()
     white: Player = Player(Color.white, board)
     black: Player = Player(Color.black, board)
+    white.opponent = black
+    black.opponent = white
     origin: Optional[str] = None
     target: Optional[str] = None
+    promotion: int = QUEEN
     
     while not game_over:
         match state:
@@ -42,7 +48,7 @@ def main():
             # ======================================================================
             # Prompt white to input a move
             case State.PROMPT_MOVE_WHITE:
-                origin, target = prompt("White")
+                origin, target, promotion = prompt("White")
                 state = State.VALIDATE_INPUT_WHITE
             # Ensure white's input is a valid format.
             # If the input is invalid, set state to INVALID_MOVE_WHITE,
@@ -61,21 +67,20 @@ def main():
             # If the move is executed successfully, set state to SURVEY_BOARD_WHITE
             # else, set the state to INVALID_MOVE_WHITE
             case State.EXECUTE_MOVE_WHITE:
-                if white.make_move(origin, target):
+                if white.make_move(origin, target, promotion):
                     print(board)
                     state = State.SURVEY_BOARD_WHITE
                 else:
                     state = State.INVALID_MOVE_WHITE
             case State.SURVEY_BOARD_WHITE:
-                if white.pawn_promotion():
-                    print(board)
+                game_over = is_game_over(black)
                 state = State.PROMPT_MOVE_BLACK
             # ======================================================================
             #                          BLACK'S TURN
             # ======================================================================
             case State.PROMPT_MOVE_BLACK:
                 print(f"Current: {state}")
-                origin, target = prompt("Black")
+                origin, target, promotion = prompt("Black")
                 state = State.VALIDATE_INPUT_BLACK
             case State.VALIDATE_INPUT_BLACK:
                 print(f"Current: {state}")
@@ -85,15 +90,14 @@ def main():
                     state = State.EXECUTE_MOVE_BLACK
             case State.EXECUTE_MOVE_BLACK:
                 print(f"Current: {state}")
-                if black.make_move(origin, target):
+                if black.make_move(origin, target, promotion):
                     print(board)
                     state = State.SURVEY_BOARD_BLACK
                 else:
                     state = State.INVALID_MOVE_BLACK
             case State.SURVEY_BOARD_BLACK:
                 print(f"Current: {state}")
-                if black.pawn_promotion():
-                    print(board)
+                game_over = is_game_over(white)
                 state = State.PROMPT_MOVE_WHITE
             case State.INVALID_MOVE_BLACK:
                 print(f"Current: {state}")
@@ -101,12 +105,31 @@ def main():
                 state = State.PROMPT_MOVE_BLACK
 
 
+def is_game_over(player: Player) -> bool:
+    """
+    Checks whether the game has ended with the given player to move, and prints how.
+    :param player: the player to move
+    :return: True if the player is checkmated or stalemated, or the game is drawn
+    """
+    draw_reason: Optional[str] = player.draw_reason()
+    if player.is_in_checkmate():
+        print(f"{str(player.color).upper()} IS IN CHECKMATE")
+    elif player.is_in_stalemate():
+        print("STALEMATE")
+    elif draw_reason is not None:
+        print(f"DRAW BY {draw_reason.upper()}")
+    else:
+        return False
+    return True
+
+
 def prompt(color):
-    input_string = input(f"{color}: Enter a move (e.g. 'a2 c4'): ")
+    input_string = input(f"{color}: Enter a move (e.g. 'a2 c4', or 'e7 e8 n' to promote to a knight): ")
     split_input = input_string.split(" ")
     origin = split_input[0]
-    target = split_input[1]
-    return origin, target
+    target = split_input[1] if len(split_input) > 1 else ""
+    promotion = PROMOTION_LETTERS.get(split_input[2].lower(), QUEEN) if len(split_input) > 2 else QUEEN
+    return origin, target, promotion
 
 if __name__ == "__main__":
     main()
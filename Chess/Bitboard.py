@@ -0,0 +1,163 @@
+"""
+Bitboard helpers and precomputed attack tables.
+
+A bitboard is a Python int used as a 64-bit set of squares. Square index = rank * 8 + file, so a1 = 0, h1 = 7,
+a8 = 56 and h8 = 63.
+"""
+from typing import Iterator
+
+FULL: int = (1 << 64) - 1
+
+# square identifiers ("a1", "b1", ... "h8") indexed by square index
+SQUARE_NAMES: list[str] = [f"{'abcdefgh'[index % 8]}{index // 8 + 1}" for index in range(64)]
+# square index by identifier, so notation is converted with one lookup instead of parsing
+SQUARE_INDICES: dict[str, int] = {name: index for index, name in enumerate(SQUARE_NAMES)}
+# rank and file (0-7) of each square index
+RANK_OF: list[int] = [index // 8 for index in range(64)]
+FILE_OF: list[int] = [index % 8 for index in range(64)]
+
+# Ray directions as (rank step, file step). The first four step towards higher square indices, so the nearest
+# blocker on those rays is the lowest set bit; on the last four it is the highest set bit.
+NORTH, EAST, NORTH_EAST, NORTH_WEST, SOUTH, WEST, SOUTH_WEST, SOUTH_EAST = range(8)
+DIRECTIONS: list[tuple[int, int]] = [(1, 0), (0, 1), (1, 1), (1, -1), (-1, 0), (0, -1), (-1, -1), (-1, 1)]
+ROOK_DIRECTIONS: list[int] = [NORTH, EAST, SOUTH, WEST]
+BISHOP_DIRECTIONS: list[int] = [NORTH_EAST, NORTH_WEST, SOUTH_WEST, SOUTH_EAST]
+
+
+def square_index(rank: int, file: int) -> int:
+    """
+    Returns the 0-63 index of the square at the given rank and file.
+    :param rank: rank of the square (0-7)
+    :param file: file of the square (0-7)
+    :return: the square index
+    """
+    return rank * 8 + file
+
+
+def lowest_square(mask: int) -> int:
+    """
+    Returns the index of the lowest set square in a non-empty bitboard.
+    :param mask: bitboard
+    :return: index of the lowest set square
+    """
+    return (mask & -mask).bit_length() - 1
+
+
+def highest_square(mask: int) -> int:
+    """
+    Returns the index of the highest set square in a non-empty bitboard.
+    :param mask: bitboard
+    :return: index of the highest set square
+    """
+    return mask.bit_length() - 1
+
+
+def squares_of(mask: int) -> Iterator[int]:
+    """
+    Yields the index of every set square in a bitboard, lowest first.
+    :param mask: bitboard
+    :return: iterator over square indices
+    """
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+def _on_board(rank: int, file: int) -> bool:
+    return 0 <= rank < 8 and 0 <= file < 8
+
+
+def _offset_table(offsets: list[tuple[int, int]]) -> list[int]:
+    table: list[int] = []
+    for index in range(64):
+        rank, file = divmod(index, 8)
+        mask = 0
+        for rank_step, file_step in offsets:
+            if _on_board(rank + rank_step, file + file_step):
+                mask |= 1 << square_index(rank + rank_step, file + file_step)
+        table.append(mask)
+    return table
+
+
+def _ray_table() -> list[list[int]]:
+    table: list[list[int]] = []
+    for rank_step, file_step in DIRECTIONS:
+        rays: list[int] = []
+        for index in range(64):
+            rank, file = divmod(index, 8)
+            mask = 0
+            rank, file = rank + rank_step, file + file_step
+            while _on_board(rank, file):
+                mask |= 1 << square_index(rank, file)
+                rank, file = rank + rank_step, file + file_step
+            rays.append(mask)
+        table.append(rays)
+    return table
+
+
+KNIGHT_ATTACKS: list[int] = _offset_table([(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)])
+KING_ATTACKS: list[int] = _offset_table([(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)])
+# Squares attacked by a pawn, indexed by color value (white = 0, black = 1) and then by square
+PAWN_ATTACKS: list[list[int]] = [_offset_table([(1, -1), (1, 1)]), _offset_table([(-1, -1), (-1, 1)])]
+RAYS: list[list[int]] = _ray_table()
+
+
+def _between_table() -> tuple[list[list[int]], list[list[int]]]:
+    between: list[list[int]] = [[0] * 64 for _ in range(64)]
+    line: list[list[int]] = [[0] * 64 for _ in range(64)]
+    for origin in range(64):
+        for direction in range(8):
+            opposite = (direction + 4) % 8
+            full_line = RAYS[direction][origin] | RAYS[opposite][origin] | 1 << origin
+            for target in squares_of(RAYS[direction][origin]):
+                between[origin][target] = RAYS[direction][origin] & ~RAYS[direction][target] & ~(1 << target)
+                line[origin][target] = full_line
+    return between, line
+
+
+# BETWEEN[a][b] holds the squares strictly between two squares on a shared rank, file or diagonal (0 otherwise).
+# LINE[a][b] holds the whole rank, file or diagonal through both squares (0 if they are not aligned).
+BETWEEN, LINE = _between_table()
+
+
+def _slider_attacks(index: int, occupied: int, directions: list[int]) -> int:
+    attacks = 0
+    for direction in directions:
+        ray = RAYS[direction][index]
+        blockers = ray & occupied
+        if blockers:
+            blocker = lowest_square(blockers) if direction < 4 else highest_square(blockers)
+            ray ^= RAYS[direction][blocker]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(index: int, occupied: int) -> int:
+    """
+    Returns the squares a rook on the given square attacks, stopping at (and including) the first blocker.
+    :param index: square index of the rook
+    :param occupied: bitboard of all occupied squares
+    :return: bitboard of attacked squares
+    """
+    return _slider_attacks(index, occupied, ROOK_DIRECTIONS)
+
+
+def bishop_attacks(index: int, occupied: int) -> int:
+    """
+    Returns the squares a bishop on the given square attacks, stopping at (and including) the first blocker.
+    :param index: square index of the bishop
+    :param occupied: bitboard of all occupied squares
+    :return: bitboard of attacked squares
+    """
+    return _slider_attacks(index, occupied, BISHOP_DIRECTIONS)
+
+
+def queen_attacks(index: int, occupied: int) -> int:
+    """
+    Returns the squares a queen on the given square attacks, stopping at (and including) the first blocker.
+    :param index: square index of the queen
+    :param occupied: bitboard of all occupied squares
+    :return: bitboard of attacked squares
+    """
+    return _slider_attacks(index, occupied, ROOK_DIRECTIONS) | _slider_attacks(index, occupied, BISHOP_DIRECTIONS)
@@ -1,7 +1,11 @@
-import tkinter as tk
 from typing import Optional
-from Chess.Piece import Color
 from Square import Square
+from Bitboard import (SQUARE_INDICES, BETWEEN, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, squares_of, rook_attacks,
+                      bishop_attacks, queen_attacks)
+from Zobrist import (PIECE_KEYS, SIDE_KEY, CASTLING_KEYS, EN_PASSANT_KEYS, CASTLE_WHITE_KINGSIDE,
+                     CASTLE_WHITE_QUEENSIDE, CASTLE_BLACK_KINGSIDE, CASTLE_BLACK_QUEENSIDE)
+from Evaluation import PST_MG, PST_EG, PHASE_WEIGHTS
+from Chess.Piece import Color, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
 
 def is_valid_rank(origin: Square, target: Square) -> bool:
     """
@@ -35,33 +39,302 @@ def is_valid_diagonal(origin: Square, target: Square) -> bool:
     return rank_difference == file_difference
 
 
+class MoveRecord:
+    __slots__ = ("player", "move", "piece", "origin", "target", "piece_moved", "captured", "captured_square", "rook",
+                 "rook_origin", "rook_moved", "promoted", "promoted_index", "en_passant_square", "castling", "turn",
+                 "key", "halfmove_clock", "fullmove_number")
+
+    def __init__(self, player: 'Player', move: 'Move', piece: 'Piece', origin: Square, target: Square):
+        """
+        Stores everything needed to undo one move made on the board.
+        :param player: The player who made the move
+        :param move: The move that was made
+        :param piece: The piece that moved
+        :param origin: The square the piece moved from
+        :param target: The square the piece moved to
+        """
+        self.player: 'Player' = player
+        self.move: 'Move' = move
+        self.piece: 'Piece' = piece
+        self.origin: Square = origin
+        self.target: Square = target
+        self.piece_moved: bool = piece.has_moved()
+        self.captured: Optional['Piece'] = None
+        self.captured_square: Optional[Square] = None
+        self.rook: Optional['Piece'] = None
+        self.rook_origin: Optional[Square] = None
+        self.rook_moved: bool = False
+        self.promoted: Optional['Piece'] = None
+        self.promoted_index: int = -1
+        self.en_passant_square: Optional[int] = player.board.en_passant_square
+        self.castling: int = player.board.castling
+        self.turn: Color = player.board.turn
+        self.key: int = player.board.key
+        self.halfmove_clock: int = player.board.halfmove_clock
+        self.fullmove_number: int = player.board.fullmove_number
+
+
 class Board:
-    def __init__(self, display: bool = False):
+    def __init__(self):
+        """
+        Constructs a new headless Board. The board only holds the position; rendering lives in BoardDisplay.
+        """
         self.squares: list[list[Optional[Square]]] = [[None for _ in range(8)] for _ in range(8)]
+        # the same squares as a flat list indexed by square index (rank * 8 + file)
+        self.square_list: list[Square] = []
         for rank in range(8):
             for file in range(8):
-                self.squares[rank][file] = Square(rank=rank, file=file, occupant=None)
-        self.root = tk.Tk() if display else None
-        self.root.title('Chess Board') if display else None
-        self.board_frame = tk.Frame(self.root) if display else None
-        self.board_frame.pack() if display else None
-        self.selected_squares = [] if display else None
-        self.images = self.load_images()
-        # clear image for empty squares because for some reason the square dimensions are messed up if they don't
-        # have an image.
-        self.dummy_image = tk.PhotoImage(width=64, height=64)
-
-    def on_click(self, rank_no: int, file_no: int) -> None:
-        """
-        When the user clicks on a square, adds the square to the selected squares
-        :param rank_no: The rank of the square that was clicked
-        :param file_no: The file of the square that was clicked
-        """
-        file_ids: list[str] = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
-        file_id: str = file_ids[file_no]
-        rank_id: str = f"{rank_no + 1}"
-        square_id: str = f"{file_id}{rank_id}"
-        self.selected_squares.append(square_id)
+                self.squares[rank][file] = Square(rank=rank, file=file, occupant=None, board=self)
+                self.square_list.append(self.squares[rank][file])
+        # Bitboards kept in sync by Square.set_occupant: one per color and piece kind, one per color and the union
+        self.piece_masks: list[list[int]] = [[0] * 6 for _ in range(2)]
+        self.color_masks: list[int] = [0, 0]
+        self.occupied: int = 0
+        # Incremental attack maps: the squares attacked from each square, how many pieces of each color attack each
+        # square, and per color the bitboard of squares attacked at least once
+        self.attack_sets: list[int] = [0] * 64
+        self.attack_counts: list[list[int]] = [[0] * 64 for _ in range(2)]
+        self.attacked: list[int] = [0, 0]
+        # Incremental evaluation terms per color: the sum of Piece.value(), the middlegame and endgame piece-square
+        # totals, and the game phase of the pieces on the board
+        self.material: list[int] = [0, 0]
+        self.psqt_mg: list[int] = [0, 0]
+        self.psqt_eg: list[int] = [0, 0]
+        self.phase: int = 0
+        # Index of the square a pawn skipped over with a double push on the last move (en passant target)
+        self.en_passant_square: Optional[int] = None
+        # Castling rights as a mask of the Zobrist CASTLE_* bits, derived from the King/Rook moved flags
+        self.castling: int = 0
+        # The color of the player to move
+        self.turn: Color = Color.white
+        # Zobrist key of the position, updated incrementally as pieces, rights and the side to move change
+        self.key: int = 0
+        # Plies since the last capture or pawn move (for the fifty-move rule), and the number of the current move,
+        # which starts at 1 and goes up after each of black's moves
+        self.halfmove_clock: int = 0
+        self.fullmove_number: int = 1
+        # Zobrist key of the pawns alone (no side, castling or en passant), used to cache pawn structure scores
+        self.pawn_key: int = 0
+        # Indices of the squares whose occupant changed since a display last drew the board
+        self.dirty_squares: set[int] = set(range(64))
+        # Undo information for every move made on this board, most recent last
+        self.history: list[MoveRecord] = []
+        # Number of times each position (by key) occurred before the current one, for detecting repetitions. Counted
+        # up when a move leaves a position and down when the move is unmade.
+        self.repetitions: dict[int, int] = {}
+
+    def update_masks(self, index: int, old_occupant: Optional['Piece'], new_occupant: Optional['Piece']) -> None:
+        """
+        Updates the bitboards, key, attack maps and evaluation terms after the occupant of a square changed.
+        Called by Square.set_occupant.
+        :param index: index of the square that changed
+        :param old_occupant: the previous occupant of the square (or None)
+        :param new_occupant: the new occupant of the square (or None)
+        """
+        bit: int = 1 << index
+        self.dirty_squares.add(index)
+        if old_occupant is not None:
+            color: int = old_occupant.color.value
+            self.piece_masks[color][old_occupant.kind] &= ~bit
+            self.color_masks[color] &= ~bit
+            self.key ^= PIECE_KEYS[color][old_occupant.kind][index]
+            if old_occupant.kind == PAWN:
+                self.pawn_key ^= PIECE_KEYS[color][PAWN][index]
+            self.material[color] -= old_occupant.value()
+            self.psqt_mg[color] -= PST_MG[color][old_occupant.kind][index]
+            self.psqt_eg[color] -= PST_EG[color][old_occupant.kind][index]
+            self.phase -= PHASE_WEIGHTS[old_occupant.kind]
+        if new_occupant is not None:
+            color: int = new_occupant.color.value
+            self.piece_masks[color][new_occupant.kind] |= bit
+            self.color_masks[color] |= bit
+            self.key ^= PIECE_KEYS[color][new_occupant.kind][index]
+            if new_occupant.kind == PAWN:
+                self.pawn_key ^= PIECE_KEYS[color][PAWN][index]
+            self.material[color] += new_occupant.value()
+            self.psqt_mg[color] += PST_MG[color][new_occupant.kind][index]
+            self.psqt_eg[color] += PST_EG[color][new_occupant.kind][index]
+            self.phase += PHASE_WEIGHTS[new_occupant.kind]
+        self.occupied = self.color_masks[0] | self.color_masks[1]
+
+        # the piece on this square changed, and every slider whose ray reaches this square now sees further or less far
+        old_color: Optional[int] = None if old_occupant is None else old_occupant.color.value
+        self.update_attacks(index, old_color)
+        masks_white, masks_black = self.piece_masks
+        diagonal: int = masks_white[BISHOP] | masks_white[QUEEN] | masks_black[BISHOP] | masks_black[QUEEN]
+        straight: int = masks_white[ROOK] | masks_white[QUEEN] | masks_black[ROOK] | masks_black[QUEEN]
+        sliders: int = ((bishop_attacks(index, self.occupied) & diagonal) |
+                        (rook_attacks(index, self.occupied) & straight)) & ~bit
+        for slider in squares_of(sliders):
+            slider_color: int = self.square_list[slider].occupant.color.value
+            self.update_attacks(slider, slider_color)
+
+    def update_attacks(self, index: int, old_color: Optional[int]) -> None:
+        """
+        Recomputes the attack set of one square and applies the difference to the attack maps.
+        :param index: index of the square whose attack set may have changed
+        :param old_color: color value of the piece the old attack set belonged to (None if the square was empty)
+        """
+        old_attacks: int = self.attack_sets[index]
+        new_attacks: int = self.attacks_from(index)
+        occupant: Optional['Piece'] = self.square_list[index].occupant
+        new_color: Optional[int] = None if occupant is None else occupant.color.value
+        if old_color != new_color:
+            # every old attack goes away and every new one is added
+            removed, added = old_attacks, new_attacks
+        else:
+            removed, added = old_attacks & ~new_attacks, new_attacks & ~old_attacks
+        if removed:
+            counts: list[int] = self.attack_counts[old_color]
+            for square in squares_of(removed):
+                counts[square] -= 1
+                if not counts[square]:
+                    self.attacked[old_color] &= ~(1 << square)
+        if added:
+            counts: list[int] = self.attack_counts[new_color]
+            for square in squares_of(added):
+                counts[square] += 1
+            self.attacked[new_color] |= added
+        self.attack_sets[index] = new_attacks
+
+    def castling_rights(self) -> int:
+        """
+        Derives the castling rights from the King and Rook moved flags: a side may castle on a wing while its king
+        and that wing's rook are still unmoved on their starting squares.
+        :return: mask of the Zobrist CASTLE_* bits
+        """
+        rights: int = 0
+        for color, king_index, kingside_right, queenside_right in [
+                (Color.white, 4, CASTLE_WHITE_KINGSIDE, CASTLE_WHITE_QUEENSIDE),
+                (Color.black, 60, CASTLE_BLACK_KINGSIDE, CASTLE_BLACK_QUEENSIDE)]:
+            king: Optional['Piece'] = self.square_list[king_index].occupant
+            if king is None or king.kind != KING or king.color is not color or king.has_moved():
+                continue
+            for rook_index, right in [(king_index + 3, kingside_right), (king_index - 4, queenside_right)]:
+                rook: Optional['Piece'] = self.square_list[rook_index].occupant
+                if rook is not None and rook.kind == ROOK and rook.color is color and not rook.has_moved():
+                    rights |= right
+        return rights
+
+    def update_castling(self) -> None:
+        """
+        Recomputes the castling rights after a move and updates the key if they changed.
+        """
+        rights: int = self.castling_rights()
+        if rights != self.castling:
+            self.key ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[rights]
+            self.castling = rights
+
+    def set_en_passant_square(self, index: Optional[int]) -> None:
+        """
+        Sets the en passant square and updates the key with its file.
+        :param index: index of the square a pawn just skipped over, or None
+        """
+        if self.en_passant_square is not None:
+            self.key ^= EN_PASSANT_KEYS[self.en_passant_square % 8]
+        self.en_passant_square = index
+        if index is not None:
+            self.key ^= EN_PASSANT_KEYS[index % 8]
+
+    def set_turn(self, color: Color) -> None:
+        """
+        Sets the side to move and updates the key if it changed.
+        :param color: color of the player to move
+        """
+        if color is not self.turn:
+            self.key ^= SIDE_KEY
+            self.turn = color
+
+    def set_state(self, turn: Color, en_passant_square: Optional[int], halfmove_clock: int = 0,
+                  fullmove_number: int = 1) -> None:
+        """
+        Sets the side to move, en passant square and move clocks of a position that was set up piece by piece,
+        derives the castling rights and recomputes the key from scratch.
+        :param turn: color of the player to move
+        :param en_passant_square: en passant square index, or None
+        :param halfmove_clock: plies since the last capture or pawn move
+        :param fullmove_number: number of the current move
+        """
+        self.turn = turn
+        self.en_passant_square = en_passant_square
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self.castling = self.castling_rights()
+        self.key = self.compute_key()
+
+    def repetition_count(self) -> int:
+        """
+        Counts how many times the current position has occurred, including now.
+        :return: the number of occurrences (1 for a position that has not been seen before)
+        """
+        return self.repetitions.get(self.key, 0) + 1
+
+    def compute_key(self) -> int:
+        """
+        Computes the Zobrist key of the position from scratch.
+        :return: the Zobrist key
+        """
+        key: int = 0
+        for square in self.square_list:
+            if square.occupant is not None:
+                key ^= PIECE_KEYS[square.occupant.color.value][square.occupant.kind][square.index]
+        key ^= CASTLING_KEYS[self.castling]
+        if self.en_passant_square is not None:
+            key ^= EN_PASSANT_KEYS[self.en_passant_square % 8]
+        if self.turn is Color.black:
+            key ^= SIDE_KEY
+        return key
+
+    def attacks_from(self, index: int) -> int:
+        """
+        Returns the bitboard of squares attacked by the piece on the given square.
+        Sliding attacks stop at (and include) the first occupied square.
+        :param index: index of the square
+        :return: bitboard of attacked squares, 0 if the square is empty
+        """
+        piece: Optional['Piece'] = self.square_list[index].occupant
+        if piece is None:
+            return 0
+        kind: int = piece.kind
+        if kind == PAWN:
+            return PAWN_ATTACKS[piece.color.value][index]
+        if kind == KNIGHT:
+            return KNIGHT_ATTACKS[index]
+        if kind == BISHOP:
+            return bishop_attacks(index, self.occupied)
+        if kind == ROOK:
+            return rook_attacks(index, self.occupied)
+        if kind == QUEEN:
+            return queen_attacks(index, self.occupied)
+        return KING_ATTACKS[index]
+
+    def is_attacked(self, index: int, color: Color) -> bool:
+        """
+        Checks whether any piece of the given color attacks the given square, using the incremental attack maps.
+        :param index: index of the square
+        :param color: color of the attacking pieces
+        :return: True if the square is attacked, otherwise False
+        """
+        return bool(self.attacked[color.value] >> index & 1)
+
+    def attackers_to(self, index: int, color: Color, occupied: Optional[int] = None) -> int:
+        """
+        Returns the bitboard of pieces of the given color that attack the given square.
+        :param index: index of the square
+        :param color: color of the attacking pieces
+        :param occupied: occupancy to use for sliding pieces (defaults to the current occupancy)
+        :return: bitboard of the attacking pieces
+        """
+        if occupied is None:
+            occupied = self.occupied
+        masks: list[int] = self.piece_masks[color.value]
+        # a pawn of `color` attacks the square if a pawn of the other color on that square would attack it
+        result: int = PAWN_ATTACKS[color.value ^ 1][index] & masks[PAWN]
+        result |= KNIGHT_ATTACKS[index] & masks[KNIGHT]
+        result |= KING_ATTACKS[index] & masks[KING]
+        result |= bishop_attacks(index, occupied) & (masks[BISHOP] | masks[QUEEN])
+        result |= rook_attacks(index, occupied) & (masks[ROOK] | masks[QUEEN])
+        return result
 
     def square_at_index(self, rank: int, file: int) -> Square:
         """
@@ -69,7 +342,7 @@ class Board:
         :param rank: The rank of the square
         :param file: The file of the square
         """
-        return self.squares[rank][file]
+        return self.square_list[rank * 8 + file]
 
     def square_at(self, identifier: str) -> Square:
         """
@@ -77,11 +350,7 @@ class Board:
         :param identifier: The identifier of the square
         :return: The square instance with the given identifier
         """
-        file_char: str = identifier[0]
-        rank_char: str = identifier[1]
-        file_index: int = ord(file_char) - ord('a')
-        rank_index: int = int(rank_char) - 1
-        return self.square_at_index(rank_index, file_index)
+        return self.square_list[SQUARE_INDICES[identifier]]
 
     def is_clear_rank(self, origin: Square, target: Square) -> bool:
         """
@@ -90,18 +359,7 @@ class Board:
         :param target: The target square
         :return: True if the rank between the origin and target square is clear, False otherwise
         """
-        is_clear: bool = is_valid_rank(origin, target)
-        if is_clear:
-            rank: int = origin.get_rank()
-            for file in range(origin.get_file() + 1, target.get_file()):
-                current = self.square_at_index(rank, file)
-                if current.is_occupied():
-                    is_clear = False
-            for file in range(target.get_file() + 1, origin.get_file()):
-                current = self.square_at_index(rank, file)
-                if current.is_occupied():
-                    is_clear = False
-        return is_clear
+        return is_valid_rank(origin, target) and not BETWEEN[origin.index][target.index] & self.occupied
 
     def is_clear_file(self, origin: Square, target: Square) -> bool:
         """
@@ -110,18 +368,7 @@ class Board:
         :param target: The target square
         :return: True if the file between the origin and target square is clear, False otherwise
         """
-        is_clear: bool = is_valid_file(origin, target)
-        if is_clear:
-            file: int = origin.get_file()
-            for rank in range(origin.get_rank() + 1, target.get_rank()):
-                current = self.square_at_index(rank, file)
-                if current.is_occupied():
-                    is_clear = False
-            for rank in range(target.get_rank() + 1, origin.get_rank()):
-                current = self.square_at_index(rank, file)
-                if current.is_occupied():
-                    is_clear = False
-        return is_clear
+        return is_valid_file(origin, target) and not BETWEEN[origin.index][target.index] & self.occupied
 
     def is_clear_diagonal(self, origin: Square, target: Square) -> bool:
         """
@@ -130,78 +377,7 @@ class Board:
         :param target: The target square
         :return: True if there is a clear diagonal, False otherwise
         """
-        rank_difference: int = abs(origin.get_rank() - target.get_rank())
-
-        if not is_valid_diagonal(origin, target):
-            return False
-
-        rank_step = 1 if target.get_rank() > origin.get_rank() else -1
-        file_step = 1 if target.get_file() > origin.get_file() else -1
-
-        for i in range(1, rank_difference):
-            rank = origin.get_rank() + i * rank_step
-            file = origin.get_file() + i * file_step
-
-            if self.square_at_index(rank, file).is_occupied():
-                return False
-
-        return True
-
-    def load_images(self) -> dict[str, tk.PhotoImage]:
-        """
-        Load images for the chess pieces and return a dictionary mapping piece types to images.
-        """
-        images = {
-            "white_king":   tk.PhotoImage(file="assets/White King.png"),
-            "white_queen":  tk.PhotoImage(file="assets/White Queen.png"),
-            "white_bishop": tk.PhotoImage(file="assets/White Bishop.png"),
-            "white_knight": tk.PhotoImage(file="assets/White Knight.png"),
-            "white_rook":   tk.PhotoImage(file="assets/White Rook.png"),
-            "white_pawn":   tk.PhotoImage(file="assets/White Pawn.png"),
-            "black_king":   tk.PhotoImage(file="assets/Black King.png"),
-            "black_queen":  tk.PhotoImage(file="assets/Black Queen.png"),
-            "black_bishop": tk.PhotoImage(file="assets/Black Bishop.png"),
-            "black_knight": tk.PhotoImage(file="assets/Black Knight.png"),
-            "black_rook":   tk.PhotoImage(file="assets/Black Rook.png"),
-            "black_pawn":   tk.PhotoImage(file="assets/Black Pawn.png")
-        }
-        return images
-
-    def update_display(self) -> None:
-        """
-        Updates the GUI display.
-        """
-        light_color: str = '#F3CAAA'
-        dark_color: str = '#B07F60'
-
-        for widget in self.board_frame.winfo_children():
-            widget.destroy()
-
-        for rank in range(8):
-            for file in range(8):
-                square: Square = self.squares[7 - rank][file]
-                color: str = light_color if (rank + file) % 2 == 0 else dark_color
-
-                if square.is_occupied():
-                    occupant = square.get_occupant()
-                    piece_color = "white" if occupant.get_color() == Color.white else "black"
-                    piece_type = occupant.__class__.__name__.lower()  # Example: "king", "queen"
-                    image_key = f"{piece_color}_{piece_type}"  # Example: "white_king"
-                    piece_image = self.images.get(image_key)
-                else:
-                    # Use placeholder image for empty squares
-                    piece_image = self.dummy_image
-
-                button = tk.Button(
-                    self.board_frame,
-                    image=piece_image,
-                    height=64,
-                    width=64,
-                    bg=color,
-                    command=lambda r=7 - rank, f=file: self.on_click(r, f),
-                )
-                button.image = piece_image  # Prevent image garbage collection
-                button.grid(row=rank, column=file)
+        return is_valid_diagonal(origin, target) and not BETWEEN[origin.index][target.index] & self.occupied
 
     def piece_at(self, identifier: str) -> 'Piece':
         """
@@ -0,0 +1,133 @@
+import os
+import tkinter as tk
+from typing import Callable, Optional
+from Board import Board
+from Bitboard import SQUARE_NAMES
+from Chess.Piece import Color, KNIGHT, BISHOP, ROOK, QUEEN
+
+ASSETS_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+# Piece images are shared by every BoardDisplay and only loaded the first time a board is drawn.
+_images: Optional[dict[str, tk.PhotoImage]] = None
+
+# pieces offered when a pawn promotes, by image name
+PROMOTION_CHOICES: list[tuple[str, int]] = [("queen", QUEEN), ("rook", ROOK), ("bishop", BISHOP), ("knight", KNIGHT)]
+
+
+def load_images() -> dict[str, tk.PhotoImage]:
+    """
+    Load images for the chess pieces and return a dictionary mapping piece types to images.
+    The images are loaded once and cached, so a Tk root window must exist before the first call.
+    :return: dictionary mapping piece keys (e.g. "white_king") to images
+    """
+    global _images
+    if _images is None:
+        _images = {}
+        for color in ["white", "black"]:
+            for piece_type in ["king", "queen", "bishop", "knight", "rook", "pawn"]:
+                file_name = f"{color.title()} {piece_type.title()}.png"
+                _images[f"{color}_{piece_type}"] = tk.PhotoImage(file=os.path.join(ASSETS_DIR, file_name))
+        # clear image for empty squares because for some reason the square dimensions are messed up if they don't
+        # have an image.
+        _images["empty"] = tk.PhotoImage(width=64, height=64)
+    return _images
+
+
+class BoardDisplay:
+    def __init__(self, board: Board):
+        """
+        Constructs a Tkinter window that renders the given board.
+        :param board: The (headless) board to render
+        """
+        self.board: Board = board
+        self.root = tk.Tk()
+        self.root.title('Chess Board')
+        self.board_frame = tk.Frame(self.root)
+        self.board_frame.pack()
+        self.selected_squares: list[str] = []
+        # the square buttons by square index, and the image key each one currently shows
+        self.buttons: list[Optional[tk.Button]] = [None] * 64
+        self.shown: list[Optional[str]] = [None] * 64
+        # called with the square's identifier after every click (e.g. by a GameController)
+        self.click_handler: Optional[Callable[[str], None]] = None
+
+    def on_click(self, rank_no: int, file_no: int) -> None:
+        """
+        When the user clicks on a square, adds the square to the selected squares and notifies the click handler
+        :param rank_no: The rank of the square that was clicked
+        :param file_no: The file of the square that was clicked
+        """
+        square_id: str = SQUARE_NAMES[rank_no * 8 + file_no]
+        self.selected_squares.append(square_id)
+        if self.click_handler is not None:
+            self.click_handler(square_id)
+
+    def create_squares(self) -> None:
+        """
+        Creates the 64 square buttons. They are kept for the lifetime of the display and only change their image.
+        """
+        light_color: str = '#F3CAAA'
+        dark_color: str = '#B07F60'
+        images = load_images()
+
+        for rank in range(8):
+            for file in range(8):
+                color: str = light_color if (rank + file) % 2 == 0 else dark_color
+                button = tk.Button(
+                    self.board_frame,
+                    image=images["empty"],
+                    height=64,
+                    width=64,
+                    bg=color,
+                    command=lambda r=7 - rank, f=file: self.on_click(r, f),
+                )
+                button.grid(row=rank, column=file)
+                self.buttons[(7 - rank) * 8 + file] = button
+
+    def update_display(self) -> None:
+        """
+        Updates the GUI display. Only the squares whose occupant changed since the last update are redrawn.
+        """
+        images = load_images()
+        if self.buttons[0] is None:
+            self.create_squares()
+
+        for index in self.board.dirty_squares:
+            occupant = self.board.square_list[index].get_occupant()
+            if occupant is not None:
+                piece_color = "white" if occupant.get_color() == Color.white else "black"
+                piece_type = occupant.__class__.__name__.lower()  # Example: "king", "queen"
+                image_key = f"{piece_color}_{piece_type}"  # Example: "white_king"
+            else:
+                # Use placeholder image for empty squares
+                image_key = "empty"
+            # a square that was left and re-entered by the same piece (e.g. during a search) needs no redraw
+            if image_key != self.shown[index]:
+                self.buttons[index].configure(image=images[image_key])
+                self.shown[index] = image_key
+        self.board.dirty_squares.clear()
+
+    def choose_promotion(self, color: Color) -> int:
+        """
+        Asks which piece a pawn promotes to with a small window of piece buttons, and waits for the answer.
+        :param color: the color of the promoting pawn
+        :return: the chosen piece kind (QUEEN if the window is closed without a choice)
+        """
+        images = load_images()
+        piece_color: str = "white" if color == Color.white else "black"
+        choice: list[int] = [QUEEN]
+        window = tk.Toplevel(self.root)
+        window.title("Promote to")
+        window.transient(self.root)
+
+        def choose(kind: int) -> None:
+            choice[0] = kind
+            window.destroy()
+
+        for column, (name, kind) in enumerate(PROMOTION_CHOICES):
+            tk.Button(window, image=images[f"{piece_color}_{name}"], height=64, width=64,
+                      command=lambda k=kind: choose(k)).grid(row=0, column=column)
+        # the board ignores clicks until a piece is chosen
+        window.grab_set()
+        self.root.wait_window(window)
+        return choice[0]
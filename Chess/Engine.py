@@ -0,0 +1,492 @@
+"""
+Game tree search: iterative-deepening negamax with alpha-beta pruning, a transposition table, quiescence search and
+move ordering (transposition table move, MVV-LVA captures, killer moves, history heuristic). Positions covered by
+an endgame tablebase are looked up instead of searched.
+
+With more than one worker the search runs "lazy SMP": helper processes search the same root at the same time,
+sharing nothing but the transposition table, which is placed in shared memory. What one process stores there lets the
+others cut their trees, so the main search reaches greater depths in the same time. With a single worker no process
+is started and the search is fully deterministic.
+"""
+import multiprocessing
+import time
+import weakref
+from multiprocessing import shared_memory
+from typing import Optional
+from Move import Move, EN_PASSANT
+from Evaluation import evaluate
+from PawnHashTable import PawnHashTable
+from Tablebase import Tablebase, MAX_PIECES, WIN, LOSS
+from TranspositionTable import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+MATE: int = 100000
+INFINITY: int = MATE + 1
+MAX_PLY: int = 128
+# how often (in nodes) the clock and node budget are checked
+CHECK_INTERVAL: int = 256
+
+
+class SearchStopped(Exception):
+    """
+    Raised inside the search when the time or node budget runs out.
+    """
+    pass
+
+
+class SearchResult:
+    def __init__(self, best_move: Optional[Move], score: int, depth: int, pv: list[Move], nodes: int,
+                 elapsed: float, worker_nodes: Optional[list[int]] = None):
+        """
+        Constructs a new SearchResult.
+        :param best_move: the best move found (None if the player has no legal move)
+        :param score: score of the best move in centipawns from the searching player's point of view
+        :param depth: depth of the last completed iteration
+        :param pv: principal variation, starting with the best move
+        :param nodes: number of nodes searched
+        :param elapsed: search time in seconds
+        :param worker_nodes: nodes searched by each worker, main search first (None for a single worker)
+        """
+        self.best_move: Optional[Move] = best_move
+        self.score: int = score
+        self.depth: int = depth
+        self.pv: list[Move] = pv
+        self.nodes: int = nodes
+        self.elapsed: float = elapsed
+        self.worker_nodes: Optional[list[int]] = worker_nodes
+
+    def worker_nps(self) -> list[float]:
+        """
+        Returns the search speed of each worker.
+        :return: nodes per second of each worker, main search first
+        """
+        worker_nodes: list[int] = [self.nodes] if self.worker_nodes is None else self.worker_nodes
+        return [nodes / self.elapsed if self.elapsed > 0 else 0.0 for nodes in worker_nodes]
+
+    def __str__(self) -> str:
+        pv: str = " ".join(str(move) for move in self.pv)
+        nps: str = "/".join(f"{speed:.0f}" for speed in self.worker_nps())
+        return (f"depth {self.depth} score {self.score} nodes {self.nodes} time {self.elapsed:.2f}s nps {nps} "
+                f"pv {pv}")
+
+
+class Engine:
+    def __init__(self, tt_size_mb: int = 16, workers: int = 1, table_buffer=None,
+                 tablebase: Optional[Tablebase] = None):
+        """
+        Constructs a new Engine.
+        :param tt_size_mb: size of the transposition table in megabytes
+        :param workers: number of processes to search with (1 searches in this process only)
+        :param table_buffer: optional buffer to keep the transposition table in (used by helper processes to attach
+                             to the main search's shared table)
+        :param tablebase: endgame tables to look positions with few pieces up in (used by the main search only)
+        """
+        self.tt_size_mb: int = tt_size_mb
+        self.workers: int = max(1, workers)
+        self.shared_memory: Optional[shared_memory.SharedMemory] = None
+        self.finalizer: Optional[weakref.finalize] = None
+        if self.workers > 1 and table_buffer is None:
+            self.shared_memory = shared_memory.SharedMemory(create=True, size=tt_size_mb * (1 << 20))
+            table_buffer = self.shared_memory.buf
+        self.table: TranspositionTable = TranspositionTable(tt_size_mb, table_buffer)
+        if self.shared_memory is not None:
+            # frees the segment if the engine is garbage collected or the program exits without close()
+            self.finalizer = weakref.finalize(self, release_shared_memory, self.shared_memory, self.table)
+        self.pawn_table: PawnHashTable = PawnHashTable()
+        self.tablebase: Optional[Tablebase] = tablebase
+        self.killers: list[list[Optional[Move]]] = [[None, None] for _ in range(MAX_PLY)]
+        self.history: list[list[list[int]]] = [[[0] * 64 for _ in range(64)] for _ in range(2)]
+        self.pv_table: list[list[Move]] = [[] for _ in range(MAX_PLY + 1)]
+        self.nodes: int = 0
+        # score of the best root move of the current iteration so far, kept in case the iteration is interrupted
+        self.root_score: int = 0
+        # whether some root move has been fully searched; until then the time and node budgets cannot stop the search
+        self.root_searched: bool = False
+        self.deadline: Optional[float] = None
+        self.max_nodes: Optional[int] = None
+        # set by another thread or process to stop this search
+        self.stop_event: Optional[multiprocessing.Event] = None
+
+    def close(self) -> None:
+        """
+        Frees the shared memory of a multi-process engine. The engine cannot search afterwards.
+        """
+        if self.shared_memory is not None:
+            self.finalizer()
+            self.shared_memory = None
+
+    def __enter__(self) -> 'Engine':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def evaluate(self, player: 'Player') -> int:
+        """
+        Scores a position from the point of view of the player to move.
+        :param player: the player to move
+        :return: the score in centipawns
+        """
+        return evaluate(player, self.pawn_table)
+
+    def search(self, player: 'Player', max_time: Optional[float] = None, max_nodes: Optional[int] = None,
+               max_depth: int = 64) -> SearchResult:
+        """
+        Searches the position for the given player with iterative deepening until a budget runs out, using as many
+        processes as the engine has workers. The board is searched in place and is back in its original state when
+        the search returns.
+        :param player: the player to move
+        :param max_time: time budget in seconds (None for no limit)
+        :param max_nodes: node budget of the main search (None for no limit)
+        :param max_depth: maximum depth to search to
+        :return: the result of the deepest completed iteration of the main search
+        """
+        if self.workers == 1:
+            return self.iterative_deepening(player, max_time, max_nodes, max_depth)
+
+        self.table.new_search()
+        context = multiprocessing.get_context()
+        stop_event = context.Event()
+        results = context.Queue()
+        helpers: list = []
+        for worker_id in range(1, self.workers):
+            helper = context.Process(target=search_worker, daemon=True,
+                                     args=(worker_id, player, self.shared_memory.name, self.tt_size_mb,
+                                           self.table.age, max_time, max_depth, stop_event, results))
+            helper.start()
+            helpers.append(helper)
+
+        result: SearchResult = self.iterative_deepening(player, max_time, max_nodes, max_depth, new_search=False)
+        stop_event.set()
+        helper_nodes: dict[int, int] = dict(results.get() for _ in helpers)
+        for helper in helpers:
+            helper.join()
+        result.worker_nodes = [result.nodes] + [helper_nodes[worker_id] for worker_id in range(1, self.workers)]
+        return result
+
+    def iterative_deepening(self, player: 'Player', max_time: Optional[float], max_nodes: Optional[int],
+                            max_depth: int, start_depth: int = 1, new_search: bool = True) -> SearchResult:
+        """
+        Searches the position in this process with iterative deepening until a budget runs out.
+        :param player: the player to move
+        :param max_time: time budget in seconds (None for no limit)
+        :param max_nodes: node budget (None for no limit)
+        :param max_depth: maximum depth to search to
+        :param start_depth: depth of the first iteration (helper processes start deeper to spread the work)
+        :param new_search: whether to age the transposition table entries of earlier searches
+        :return: the result of the deepest completed iteration
+        """
+        start: float = time.perf_counter()
+        self.deadline = None if max_time is None else start + max_time
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self.root_searched = False
+        if new_search:
+            self.table.new_search()
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+
+        root_moves: list[Move] = player.legal_moves()
+        if not root_moves:
+            score: int = -MATE if player.is_in_check() else 0
+            return SearchResult(None, score, 0, [], 0, time.perf_counter() - start)
+        if self.tablebase is not None:
+            # in a tablebase position the best move is known exactly
+            table_move: Optional[Move] = self.tablebase.best_move(player)
+            if table_move is not None:
+                score = self.probe_tablebase(player.board, 0)
+                return SearchResult(table_move, score, 0, [table_move], 0, time.perf_counter() - start)
+
+        result: SearchResult = SearchResult(root_moves[0], 0, 0, [root_moves[0]], 0, 0.0)
+        pv: list[Move]
+        history_length: int = len(player.board.history)
+        for depth in range(start_depth, max_depth + 1):
+            try:
+                score = self.negamax(player, depth, -INFINITY, INFINITY, 0)
+            except SearchStopped:
+                # unwind the moves the interrupted iteration left on the board
+                while len(player.board.history) > history_length:
+                    player.unmake_move()
+                # a root move that raised alpha was fully searched, and beats the previous iteration's best move
+                # (which is searched first)
+                if self.pv_table[0]:
+                    pv = list(self.pv_table[0])
+                    result = SearchResult(pv[0], self.root_score, depth - 1, pv, self.nodes, 0.0)
+                break
+            pv = list(self.pv_table[0])
+            elapsed: float = time.perf_counter() - start
+            result = SearchResult(pv[0] if pv else result.best_move, score, depth, pv, self.nodes, elapsed)
+            # a found mate will not get better, and another iteration would not finish in the remaining time
+            if abs(score) >= MATE - MAX_PLY:
+                break
+            if self.deadline is not None and elapsed > (self.deadline - start) / 2:
+                break
+        result.nodes = self.nodes
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def count_node(self) -> None:
+        """
+        Counts a node and stops the search if a budget has run out. The budgets only apply once a root move has
+        been searched, so the search always has a searched move to return.
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            if self.root_searched and self.deadline is not None and time.perf_counter() >= self.deadline:
+                raise SearchStopped()
+            if self.root_searched and self.max_nodes is not None and self.nodes >= self.max_nodes:
+                raise SearchStopped()
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise SearchStopped()
+
+    def negamax(self, player: 'Player', depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Searches a position with alpha-beta pruning.
+        :param player: the player to move
+        :param depth: remaining depth
+        :param alpha: lower bound of the search window
+        :param beta: upper bound of the search window
+        :param ply: distance from the root
+        :return: the score of the position from the player's point of view
+        """
+        if depth <= 0 or ply >= MAX_PLY:
+            return self.quiescence(player, alpha, beta, ply)
+
+        self.count_node()
+        self.pv_table[ply] = []
+        board = player.board
+        key: int = board.key
+        # a position repeated in the game or the search could be repeated again, so it is scored as a draw
+        if ply > 0 and (key in board.repetitions or board.halfmove_clock >= 100):
+            return 0
+        # the root has already been looked up by iterative_deepening
+        table_score: Optional[int] = self.probe_tablebase(board, ply) if ply > 0 else None
+        if table_score is not None:
+            return table_score
+
+        entry = self.table.probe(key)
+        tt_move_code: int = 0
+        if entry is not None:
+            entry_depth, entry_score, bound, tt_move_code = entry
+            entry_score = score_from_table(entry_score, ply)
+            if ply > 0 and entry_depth >= depth:
+                if (bound == EXACT or (bound == LOWER_BOUND and entry_score >= beta) or
+                        (bound == UPPER_BOUND and entry_score <= alpha)):
+                    return entry_score
+
+        moves: list[Move] = player.legal_moves()
+        if not moves:
+            return -MATE + ply if player.is_in_check() else 0
+
+        original_alpha: int = alpha
+        best_score: int = -INFINITY
+        best_move: Optional[Move] = None
+        for move in self.order_moves(player, moves, tt_move_code, ply):
+            capture: bool = move.flag == EN_PASSANT or board.square_list[move.target].occupant is not None
+            player.apply_move(move)
+            score: int = -self.negamax(player.opponent, depth - 1, -beta, -alpha, ply + 1)
+            player.unmake_move()
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+                self.pv_table[ply] = [move] + self.pv_table[ply + 1]
+                if ply == 0:
+                    self.root_score = score
+                    self.root_searched = True
+            if alpha >= beta:
+                if not capture and move.promotion is None:
+                    self.store_killer(move, ply)
+                    self.history[player.color.value][move.origin][move.target] += depth * depth
+                break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.table.store(key, depth, score_to_table(best_score, ply), bound, best_move.encode())
+        return best_score
+
+    def quiescence(self, player: 'Player', alpha: int, beta: int, ply: int) -> int:
+        """
+        Searches captures and promotions only until the position is quiet, so that the static evaluation is never
+        taken in the middle of an exchange. Out of check the player may also "stand pat" on the static evaluation.
+        :param player: the player to move
+        :param alpha: lower bound of the search window
+        :param beta: upper bound of the search window
+        :param ply: distance from the root
+        :return: the score of the position from the player's point of view
+        """
+        self.count_node()
+        self.pv_table[ply] = []
+        board = player.board
+        table_score: Optional[int] = self.probe_tablebase(board, ply)
+        if table_score is not None:
+            return table_score
+        moves: list[Move] = player.legal_moves()
+        in_check: bool = player.is_in_check()
+        if not moves:
+            return -MATE + ply if in_check else 0
+        # the principal variation table has no room beyond the deepest ply, even for check evasions
+        if ply >= MAX_PLY:
+            return 0 if in_check else self.evaluate(player)
+
+        if not in_check:
+            stand_pat: int = self.evaluate(player)
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+            moves = [move for move in moves if move.flag == EN_PASSANT or move.promotion is not None or
+                     board.square_list[move.target].occupant is not None]
+
+        best_score: int = alpha
+        for move in self.order_moves(player, moves, 0, ply):
+            player.apply_move(move)
+            score: int = -self.quiescence(player.opponent, -beta, -alpha, ply + 1)
+            player.unmake_move()
+            if score > best_score:
+                best_score = score
+            if score > alpha:
+                alpha = score
+                self.pv_table[ply] = [move] + self.pv_table[ply + 1]
+            if alpha >= beta:
+                break
+        return best_score
+
+    def probe_tablebase(self, board: 'Board', ply: int) -> Optional[int]:
+        """
+        Looks a position up in the endgame tablebase. A win or loss is scored like a mate found by the search, at the
+        table's distance to mate.
+        :param board: the board
+        :param ply: distance from the root
+        :return: the exact score from the point of view of the side to move, or None if the position is not covered
+        """
+        if self.tablebase is None or board.occupied.bit_count() > MAX_PIECES:
+            return None
+        entry = self.tablebase.probe(board)
+        if entry is None:
+            return None
+        result, distance = entry
+        if result == WIN:
+            return MATE - ply - distance
+        if result == LOSS:
+            return -MATE + ply + distance
+        return 0
+
+    def order_moves(self, player: 'Player', moves: list[Move], tt_move_code: int, ply: int) -> list[Move]:
+        """
+        Sorts moves so that the most promising are searched first: the transposition table move, then captures by
+        most valuable victim / least valuable attacker, then killer moves, then quiet moves by history score.
+        :param player: the player to move
+        :param moves: the moves to sort
+        :param tt_move_code: packed best move from the transposition table (0 for none)
+        :param ply: distance from the root
+        :return: the sorted moves
+        """
+        squares = player.board.square_list
+        killers: list[Optional[Move]] = self.killers[ply] if ply < MAX_PLY else [None, None]
+        history: list[list[int]] = self.history[player.color.value]
+
+        def priority(move: Move) -> int:
+            if tt_move_code and move.encode() == tt_move_code:
+                return 1 << 30
+            victim = squares[move.target].occupant
+            if victim is not None or move.flag == EN_PASSANT or move.promotion is not None:
+                victim_value: int = 1 if victim is None else victim.value()
+                attacker_value: int = squares[move.origin].occupant.value()
+                promotion_bonus: int = 0 if move.promotion is None else 100
+                return (1 << 28) + victim_value * 1000 - attacker_value + promotion_bonus
+            if move == killers[0]:
+                return (1 << 27) + 1
+            if move == killers[1]:
+                return 1 << 27
+            return history[move.origin][move.target]
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def store_killer(self, move: Move, ply: int) -> None:
+        """
+        Remembers a quiet move that caused a beta cutoff at the given ply.
+        :param move: the move
+        :param ply: distance from the root
+        """
+        if ply < MAX_PLY and move != self.killers[ply][0]:
+            self.killers[ply][1] = self.killers[ply][0]
+            self.killers[ply][0] = move
+
+
+def search_worker(worker_id: int, player: 'Player', memory_name: str, tt_size_mb: int, age: int,
+                  max_time: Optional[float], max_depth: int, stop_event, results) -> None:
+    """
+    Runs a helper search of a multi-process engine until the main search sets the stop event.
+    :param worker_id: number of the helper (1 and up); odd helpers skip the first iteration so that the helpers are
+                      not all searching the same depth at the same time
+    :param player: the player to move (a copy of the main search's position)
+    :param memory_name: name of the shared memory holding the transposition table
+    :param tt_size_mb: size of the transposition table in megabytes
+    :param age: age of the main search's transposition table entries
+    :param max_time: time budget in seconds (None for no limit)
+    :param max_depth: maximum depth to search to
+    :param stop_event: event the main search sets when it is done
+    :param results: queue the helper puts (worker_id, nodes searched) on when it stops
+    """
+    memory: Optional[shared_memory.SharedMemory] = None
+    engine: Optional[Engine] = None
+    nodes: int = 0
+    try:
+        # created inside the try, so that the main search gets its (worker_id, nodes) even if attaching fails
+        memory = shared_memory.SharedMemory(name=memory_name)
+        engine = Engine(tt_size_mb, table_buffer=memory.buf)
+        engine.table.age = age
+        engine.stop_event = stop_event
+        if not stop_event.is_set():
+            start_depth: int = 1 + worker_id % 2
+            nodes = engine.iterative_deepening(player, max_time, None, max(max_depth, start_depth), start_depth,
+                                               new_search=False).nodes
+    finally:
+        results.put((worker_id, nodes))
+        if engine is not None:
+            engine.table.release()
+        if memory is not None:
+            memory.close()
+
+
+def release_shared_memory(memory: shared_memory.SharedMemory, table: TranspositionTable) -> None:
+    """
+    Removes a shared memory segment and unmaps it from this process.
+    :param memory: the segment
+    :param table: the transposition table kept in the segment, whose views of it are released first
+    """
+    table.release()
+    memory.close()
+    memory.unlink()
+
+
+def score_to_table(score: int, ply: int) -> int:
+    """
+    Converts a mate score relative to the root into one relative to the current node before storing it.
+    :param score: score relative to the root
+    :param ply: distance from the root
+    :return: score relative to the node
+    """
+    if score >= MATE - MAX_PLY:
+        return score + ply
+    if score <= -MATE + MAX_PLY:
+        return score - ply
+    return score
+
+
+def score_from_table(score: int, ply: int) -> int:
+    """
+    Converts a mate score read from the transposition table back into one relative to the root.
+    :param score: score relative to the node
+    :param ply: distance from the root
+    :return: score relative to the root
+    """
+    if score >= MATE - MAX_PLY:
+        return score - ply
+    if score <= -MATE + MAX_PLY:
+        return score + ply
+    return score
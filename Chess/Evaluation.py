@@ -0,0 +1,251 @@
+"""
+Static evaluation: material, tapered middlegame/endgame piece-square tables, mobility, pawn structure and king safety.
+
+Material (built on Piece.value()) and the piece-square totals are kept up to date by the Board as pieces move, so
+reading them costs nothing. Mobility and king safety are read from the Board's incremental attack maps, and the pawn
+structure terms are cached per pawn skeleton in a PawnHashTable.
+"""
+from typing import Optional
+from Bitboard import RANK_OF, FILE_OF, KING_ATTACKS, PAWN_ATTACKS, squares_of, lowest_square
+from PawnHashTable import PawnHashTable
+from Chess.Piece import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+
+
+def _from_rank_8(rows: list[int]) -> list[int]:
+    """
+    Converts a table written with rank 8 on top (as a board is printed) into one indexed by square index.
+    """
+    return [rows[(7 - index // 8) * 8 + index % 8] for index in range(64)]
+
+
+PAWN_MG = _from_rank_8([
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0])
+PAWN_EG = _from_rank_8([
+    0, 0, 0, 0, 0, 0, 0, 0,
+    80, 80, 80, 80, 80, 80, 80, 80,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    30, 30, 30, 30, 30, 30, 30, 30,
+    15, 15, 15, 15, 15, 15, 15, 15,
+    5, 5, 5, 5, 5, 5, 5, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0])
+KNIGHT_TABLE = _from_rank_8([
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50])
+BISHOP_TABLE = _from_rank_8([
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20])
+ROOK_TABLE = _from_rank_8([
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0])
+QUEEN_TABLE = _from_rank_8([
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20])
+KING_MG = _from_rank_8([
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20])
+KING_EG = _from_rank_8([
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50])
+
+# PST_MG[color value][piece kind][square index]; black uses the white tables mirrored vertically
+_WHITE_MG: list[list[int]] = [PAWN_MG, KNIGHT_TABLE, BISHOP_TABLE, ROOK_TABLE, QUEEN_TABLE, KING_MG]
+_WHITE_EG: list[list[int]] = [PAWN_EG, KNIGHT_TABLE, BISHOP_TABLE, ROOK_TABLE, QUEEN_TABLE, KING_EG]
+PST_MG: list[list[list[int]]] = [_WHITE_MG, [[table[index ^ 56] for index in range(64)] for table in _WHITE_MG]]
+PST_EG: list[list[list[int]]] = [_WHITE_EG, [[table[index ^ 56] for index in range(64)] for table in _WHITE_EG]]
+
+# game phase: 24 with all minor and major pieces on the board, 0 in a pawn ending
+PHASE_WEIGHTS: list[int] = [0, 1, 1, 2, 4, 0]
+MAX_PHASE: int = 24
+
+# mobility bonus per reachable square, indexed by piece kind
+MOBILITY_MG: list[int] = [0, 4, 3, 2, 1, 0]
+MOBILITY_EG: list[int] = [0, 4, 3, 4, 2, 0]
+
+DOUBLED_PAWN: tuple[int, int] = (-10, -20)
+ISOLATED_PAWN: tuple[int, int] = (-10, -15)
+BACKWARD_PAWN: tuple[int, int] = (-8, -10)
+# passed pawn bonus by the number of ranks the pawn has advanced
+PASSED_PAWN_MG: list[int] = [0, 5, 10, 15, 25, 40, 60, 0]
+PASSED_PAWN_EG: list[int] = [0, 10, 20, 35, 55, 85, 120, 0]
+
+# king safety (middlegame only): own pawns in front of the king, enemy attacks on the squares around it
+PAWN_SHIELD: list[int] = [10, 5]
+KING_ZONE_ATTACK: int = -8
+
+FILE_MASKS: list[int] = [0x0101010101010101 << file for file in range(8)]
+ADJACENT_FILES: list[int] = [(FILE_MASKS[file - 1] if file > 0 else 0) | (FILE_MASKS[file + 1] if file < 7 else 0)
+                             for file in range(8)]
+
+
+def _rank_span(index: int, color: int, include_own_rank: bool, ahead: bool) -> int:
+    rank: int = index // 8
+    mask: int = 0
+    for other_rank in range(8):
+        in_front: bool = other_rank > rank if color == 0 else other_rank < rank
+        if other_rank == rank:
+            wanted: bool = include_own_rank
+        else:
+            wanted = in_front if ahead else not in_front
+        if wanted:
+            mask |= 0xFF << other_rank * 8
+    return mask
+
+
+# squares in front of a pawn on its own and the adjacent files (no enemy pawn there means the pawn is passed)
+PASSED_SPAN: list[list[int]] = [[_rank_span(index, color, False, True) &
+                                 (FILE_MASKS[index % 8] | ADJACENT_FILES[index % 8])
+                                 for index in range(64)] for color in range(2)]
+# squares level with or behind a pawn on the adjacent files (no own pawn there means nothing can support it)
+SUPPORT_SPAN: list[list[int]] = [[_rank_span(index, color, True, False) & ADJACENT_FILES[index % 8]
+                                  for index in range(64)] for color in range(2)]
+
+def pawn_structure(white_pawns: int, black_pawns: int) -> tuple[int, int]:
+    """
+    Scores doubled, isolated, backward and passed pawns. The result depends on the pawns only, so callers cache it
+    by pawn key (see PawnHashTable).
+    :param white_pawns: bitboard of the white pawns
+    :param black_pawns: bitboard of the black pawns
+    :return: (middlegame, endgame) score from white's point of view
+    """
+    mg: int = 0
+    eg: int = 0
+    for color, own, enemy, sign in [(0, white_pawns, black_pawns, 1), (1, black_pawns, white_pawns, -1)]:
+        for file in range(8):
+            count: int = (own & FILE_MASKS[file]).bit_count()
+            if count > 1:
+                mg += sign * DOUBLED_PAWN[0] * (count - 1)
+                eg += sign * DOUBLED_PAWN[1] * (count - 1)
+        for index in squares_of(own):
+            file = FILE_OF[index]
+            if not own & ADJACENT_FILES[file]:
+                mg += sign * ISOLATED_PAWN[0]
+                eg += sign * ISOLATED_PAWN[1]
+            if not enemy & PASSED_SPAN[color][index]:
+                advanced: int = RANK_OF[index] if color == 0 else 7 - RANK_OF[index]
+                mg += sign * PASSED_PAWN_MG[advanced]
+                eg += sign * PASSED_PAWN_EG[advanced]
+            elif not own & SUPPORT_SPAN[color][index]:
+                stop: int = index + 8 if color == 0 else index - 8
+                if 0 <= stop < 64 and PAWN_ATTACKS[color][stop] & enemy:
+                    mg += sign * BACKWARD_PAWN[0]
+                    eg += sign * BACKWARD_PAWN[1]
+
+    return mg, eg
+
+
+def mobility(board: 'Board', color: int) -> tuple[int, int]:
+    """
+    Scores the number of squares each knight, bishop, rook and queen attacks that are not occupied by its own side,
+    read from the board's incremental attack maps.
+    :param board: the board
+    :param color: color value of the side to score
+    :return: (middlegame, endgame) mobility score
+    """
+    masks: list[int] = board.piece_masks[color]
+    not_own: int = ~board.color_masks[color]
+    mg: int = 0
+    eg: int = 0
+    for kind in (KNIGHT, BISHOP, ROOK, QUEEN):
+        for index in squares_of(masks[kind]):
+            reachable: int = (board.attack_sets[index] & not_own).bit_count()
+            mg += MOBILITY_MG[kind] * reachable
+            eg += MOBILITY_EG[kind] * reachable
+    return mg, eg
+
+
+def king_safety(board: 'Board', color: int) -> int:
+    """
+    Scores the pawn shield in front of a king and the enemy attacks on the squares around it.
+    :param board: the board
+    :param color: color value of the king's side
+    :return: middlegame king safety score
+    """
+    king_mask: int = board.piece_masks[color][KING]
+    if not king_mask:
+        return 0
+    king: int = lowest_square(king_mask)
+    score: int = 0
+    forward: int = 1 if color == 0 else -1
+    pawns: int = board.piece_masks[color][PAWN]
+    shield_files: int = FILE_MASKS[FILE_OF[king]] | ADJACENT_FILES[FILE_OF[king]]
+    for distance, bonus in enumerate(PAWN_SHIELD, start=1):
+        shield_rank: int = RANK_OF[king] + distance * forward
+        if 0 <= shield_rank < 8:
+            score += bonus * (pawns & shield_files & 0xFF << shield_rank * 8).bit_count()
+    enemy_counts: list[int] = board.attack_counts[color ^ 1]
+    for index in squares_of(KING_ATTACKS[king] | king_mask):
+        score += KING_ZONE_ATTACK * enemy_counts[index]
+    return score
+
+
+def evaluate(player: 'Player', pawn_table: Optional[PawnHashTable] = None) -> int:
+    """
+    Scores a position from the point of view of the player to move.
+    :param player: the player to move
+    :param pawn_table: table to look up and store pawn structure scores in (None to always compute them)
+    :return: the score in centipawns
+    """
+    board = player.board
+    phase: int = min(board.phase, MAX_PHASE)
+    material: int = (board.material[0] - board.material[1]) * 100
+    mg: int = board.psqt_mg[0] - board.psqt_mg[1]
+    eg: int = board.psqt_eg[0] - board.psqt_eg[1]
+
+    entry = None if pawn_table is None else pawn_table.probe(board.pawn_key)
+    if entry is None:
+        pawn_mg, pawn_eg = pawn_structure(board.piece_masks[0][PAWN], board.piece_masks[1][PAWN])
+        if pawn_table is not None:
+            pawn_table.store(board.pawn_key, pawn_mg, pawn_eg)
+    else:
+        pawn_mg, pawn_eg = entry
+    white_mg, white_eg = mobility(board, 0)
+    black_mg, black_eg = mobility(board, 1)
+    mg += pawn_mg + white_mg - black_mg + king_safety(board, 0) - king_safety(board, 1)
+    eg += pawn_eg + white_eg - black_eg
+
+    score: int = material + (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+    return score if player.is_white() else -score
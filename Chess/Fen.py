@@ -0,0 +1,153 @@
+"""
+Forsyth-Edwards Notation (FEN): loading a position onto a new Board with its two Players, and writing a position
+back out. A FEN record has six space-separated fields: piece placement (rank 8 first, white pieces in upper case),
+side to move, castling rights, en passant square, halfmove clock and fullmove number.
+"""
+from typing import Optional
+from Board import Board
+from Player import Player
+from Bitboard import SQUARE_INDICES, SQUARE_NAMES
+from Zobrist import CASTLE_WHITE_KINGSIDE, CASTLE_WHITE_QUEENSIDE, CASTLE_BLACK_KINGSIDE, CASTLE_BLACK_QUEENSIDE
+from Chess.Piece import Color
+from Chess.pieces.King import King
+from Chess.pieces.Queen import Queen
+from Chess.pieces.Bishop import Bishop
+from Chess.pieces.Rook import Rook
+from Chess.pieces.Knight import Knight
+from Chess.pieces.Pawn import Pawn
+
+STARTING_FEN: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+PIECE_LETTERS: dict[str, type] = {"k": King, "q": Queen, "b": Bishop, "n": Knight, "r": Rook, "p": Pawn}
+# FEN letter of each piece kind (white pieces are written in upper case)
+KIND_LETTERS: str = "pnbrqk"
+CASTLING_LETTERS: list[tuple[int, str]] = [(CASTLE_WHITE_KINGSIDE, "K"), (CASTLE_WHITE_QUEENSIDE, "Q"),
+                                           (CASTLE_BLACK_KINGSIDE, "k"), (CASTLE_BLACK_QUEENSIDE, "q")]
+
+
+def load_fen(fen: str) -> Player:
+    """
+    Places the pieces of a FEN position on a new board and sets its side to move, castling rights, en passant
+    square and move clocks. Missing trailing fields take their usual defaults ("w - - 0 1").
+    :param fen: the position in Forsyth-Edwards Notation
+    :return: the player to move (their opponent is linked through player.opponent)
+    :raises ValueError: if the placement, side to move, en passant square or a clock is malformed, or a side does
+                        not have exactly one king
+    """
+    fields: list[str] = fen.split()
+    if not fields:
+        raise ValueError("empty FEN")
+    board: Board = Board()
+    white: Player = Player(Color.white, board, [])
+    black: Player = Player(Color.black, board, [])
+    white.opponent = black
+    black.opponent = white
+
+    ranks: list[str] = fields[0].split("/")
+    if len(ranks) != 8:
+        raise ValueError(f"FEN placement must have 8 ranks: {fields[0]}")
+    for row, rank_string in enumerate(ranks):
+        rank: int = 7 - row
+        file: int = 0
+        for letter in rank_string:
+            if letter.isdigit():
+                file += int(letter)
+                continue
+            if letter.lower() not in PIECE_LETTERS or file > 7:
+                raise ValueError(f"bad FEN rank: {rank_string}")
+            player: Player = white if letter.isupper() else black
+            piece = PIECE_LETTERS[letter.lower()](player.color, board.square_at_index(rank, file))
+            # the king is kept first in the piece list
+            if type(piece) is King:
+                if player.king is not None:
+                    raise ValueError(f"FEN has more than one {player.color} king")
+                player.king = piece
+                player.pieces.insert(0, piece)
+            else:
+                # a pawn that has left its starting rank can no longer move two squares
+                if type(piece) is Pawn:
+                    piece.moved = rank != (1 if player.is_white() else 6)
+                player.pieces.append(piece)
+            file += 1
+        if file != 8:
+            raise ValueError(f"bad FEN rank: {rank_string}")
+    if white.king is None or black.king is None:
+        raise ValueError("FEN must have a king on each side")
+
+    side: str = fields[1] if len(fields) > 1 else "w"
+    if side not in ("w", "b"):
+        raise ValueError(f"bad FEN side to move: {side}")
+    castling: str = fields[2] if len(fields) > 2 else "-"
+    for player, letters in [(white, "KQ"), (black, "kq")]:
+        home_rank: int = 0 if player.is_white() else 7
+        player.king.moved = letters[0] not in castling and letters[1] not in castling
+        for letter, rook_file in zip(letters, [7, 0]):
+            rook = board.square_at_index(home_rank, rook_file).get_occupant()
+            if type(rook) is Rook:
+                rook.moved = letter not in castling
+
+    en_passant_square: Optional[int] = None
+    if len(fields) > 3 and fields[3] != "-":
+        # the square a pawn skipped over is on the sixth rank if black just moved, or the third if white did; it is
+        # empty and the pawn that skipped it stands just beyond it
+        if fields[3] not in SQUARE_INDICES or fields[3][1] != ("6" if side == "w" else "3"):
+            raise ValueError(f"invalid en passant square in FEN: {fields[3]}")
+        en_passant_square = SQUARE_INDICES[fields[3]]
+        pawn = board.square_list[en_passant_square - 8 if side == "w" else en_passant_square + 8].get_occupant()
+        if (board.square_list[en_passant_square].is_occupied() or type(pawn) is not Pawn or
+                pawn.color is (Color.white if side == "w" else Color.black)):
+            raise ValueError(f"invalid en passant square in FEN: {fields[3]}")
+    halfmove_clock: int = int(fields[4]) if len(fields) > 4 else 0
+    fullmove_number: int = int(fields[5]) if len(fields) > 5 else 1
+    player_to_move: Player = white if side == "w" else black
+    board.set_state(player_to_move.color, en_passant_square, halfmove_clock, fullmove_number)
+    return player_to_move
+
+
+def new_game(fen: str = STARTING_FEN) -> tuple[Player, Player]:
+    """
+    Sets up a game from a FEN position (the standard starting position by default).
+    :param fen: the position in Forsyth-Edwards Notation
+    :return: the white and the black player, who share the new board
+    """
+    player: Player = load_fen(fen)
+    return (player, player.opponent) if player.is_white() else (player.opponent, player)
+
+
+def board_to_fen(board: Board) -> str:
+    """
+    Writes the position on a board in Forsyth-Edwards Notation.
+    :param board: the board
+    :return: the FEN record of the position
+    """
+    rows: list[str] = []
+    for rank in range(7, -1, -1):
+        row: str = ""
+        empty: int = 0
+        for file in range(8):
+            occupant = board.square_at_index(rank, file).get_occupant()
+            if occupant is None:
+                empty += 1
+                continue
+            if empty:
+                row += str(empty)
+                empty = 0
+            letter: str = KIND_LETTERS[occupant.kind]
+            row += letter.upper() if occupant.color is Color.white else letter
+        if empty:
+            row += str(empty)
+        rows.append(row)
+
+    castling: str = "".join(letter for bit, letter in CASTLING_LETTERS if board.castling & bit) or "-"
+    en_passant: str = "-" if board.en_passant_square is None else SQUARE_NAMES[board.en_passant_square]
+    side: str = "w" if board.turn is Color.white else "b"
+    return f"{'/'.join(rows)} {side} {castling} {en_passant} {board.halfmove_clock} {board.fullmove_number}"
+
+
+def to_fen(player: Player) -> str:
+    """
+    Writes the position of a player's board in Forsyth-Edwards Notation.
+    :param player: either player of the game
+    :return: the FEN record of the position
+    """
+    return board_to_fen(player.board)
@@ -0,0 +1,210 @@
+"""
+Event-driven game flow for the Tk GUIs. The controller reacts to square clicks and to the engine finishing its search
+instead of spinning a loop, so between events the Tk main loop is idle and waiting for a human move costs no CPU.
+"""
+from enum import Enum, auto
+from typing import Optional
+from BoardDisplay import BoardDisplay
+from Engine import Engine, SearchResult
+from Move import Move
+from OpeningBook import OpeningBook
+from Player import Player
+from SearchHandle import SearchHandle
+from Chess.Piece import Color, QUEEN
+
+# milliseconds between two checks of whether the engine has finished thinking (about 60 per second)
+ENGINE_POLL_MS: int = 16
+# milliseconds the engine's move stays unseen on the board, so the human can follow it
+ENGINE_MOVE_DELAY_MS: int = 1000
+
+
+class State(Enum):
+    SETUP = auto()
+    PROMPT_MOVE = auto()
+    THINK = auto()
+    GAME_OVER = auto()
+
+
+class GameController:
+    def __init__(self, display: BoardDisplay, white: Player, black: Player, engine: Optional[Engine] = None,
+                 engine_color: Color = Color.black, engine_move_time: float = 2.0, ponder: bool = True,
+                 book: Optional[OpeningBook] = None):
+        """
+        Constructs a new GameController and connects it to the display's square clicks.
+        :param display: the display showing the board of the two players
+        :param white: the white player
+        :param black: the black player
+        :param engine: engine playing one side (None if both sides are played by humans)
+        :param engine_color: the color the engine plays
+        :param engine_move_time: seconds the engine may think about each move
+        :param ponder: whether the engine searches the expected reply while the human is to move, for at most
+                       engine_move_time seconds, after which the CPU is idle until the human moves
+        :param book: opening book the engine plays from, without searching, while the position is in it
+        """
+        self.display: BoardDisplay = display
+        self.board = display.board
+        self.white: Player = white
+        self.black: Player = black
+        self.engine: Optional[Engine] = engine
+        self.engine_color: Color = engine_color
+        self.engine_move_time: float = engine_move_time
+        self.ponder_enabled: bool = ponder
+        self.book: Optional[OpeningBook] = book
+        self.state: State = State.SETUP
+        self.player_to_move: Player = white
+        self.search: Optional[SearchHandle] = None
+        self.ponder: Optional[SearchHandle] = None
+        self.last_result: Optional[SearchResult] = None
+        display.click_handler = self.on_square_clicked
+
+    def start(self) -> None:
+        """
+        Draws the board and starts the game with white to move.
+        """
+        self.display.update_display()
+        self.begin_turn(self.white)
+
+    def is_engine(self, player: Player) -> bool:
+        """
+        Checks whether a player's moves are chosen by the engine.
+        :param player: the player
+        :return: True if the engine plays this player's color
+        """
+        return self.engine is not None and player.color is self.engine_color
+
+    def begin_turn(self, player: Player) -> None:
+        """
+        Hands the move to a player: starts the engine's search, or waits for the human's clicks.
+        :param player: the player to move
+        """
+        self.player_to_move = player
+        if self.is_engine(player):
+            # the engine may only run one search at a time; pondering has already filled its transposition table
+            self.stop_pondering()
+            self.state = State.THINK
+            book_move: Optional[Move] = self.book.choose(player) if self.book is not None else None
+            if book_move is not None:
+                # a book reply needs no search; with no principal variation there is nothing to ponder on either
+                self.last_result = None
+                print(f"Engine: book move {book_move}")
+                self.play_engine_move(player, book_move)
+                return
+            self.search = SearchHandle(self.engine, player, max_time=self.engine_move_time)
+            self.display.root.after(ENGINE_POLL_MS, self.poll_engine)
+        else:
+            self.state = State.PROMPT_MOVE
+            if (self.engine is not None and self.ponder_enabled and self.last_result is not None and
+                    len(self.last_result.pv) >= 2):
+                self.ponder = SearchHandle(self.engine, player, max_time=self.engine_move_time,
+                                           ponder_move=self.last_result.pv[1])
+
+    def on_square_clicked(self, square_id: str) -> None:
+        """
+        Handles a click on a square. The first click selects one of the human's pieces, the second picks the target
+        (or selects another of their pieces instead). A pawn reaching the last rank promotes to the piece the human
+        picks in the display's promotion chooser.
+        :param square_id: identifier of the clicked square (e.g. "e2"); it has been added to display.selected_squares
+        """
+        selected: list[str] = self.display.selected_squares
+        if self.state is not State.PROMPT_MOVE:
+            selected.clear()
+            return
+        player: Player = self.player_to_move
+
+        if len(selected) == 1:
+            origin_sqr = self.board.square_at(selected[0])
+            if not origin_sqr.is_occupied() or origin_sqr.get_occupant().get_color() != player.color:
+                selected.clear()
+            return
+
+        target_sqr = self.board.square_at(selected[1])
+        if target_sqr.get_occupant_color() is player.color:
+            del selected[0]
+            return
+        origin_id, target_id = selected[0], selected[1]
+        selected.clear()
+        piece = self.board.square_at(origin_id).get_occupant()
+        origin, target = self.board.square_at(origin_id).index, target_sqr.index
+        promotion: int = QUEEN
+        if any(move.origin == origin and move.target == target and move.promotion is not None
+               for move in player.legal_moves()):
+            promotion = self.display.choose_promotion(player.color)
+        if player.make_move(origin_id, target_id, promotion):
+            self.display.update_display()
+            print(f"{player.color}: {piece} from {origin_id} to {target_id}")
+            self.finish_move(player)
+
+    def poll_engine(self) -> None:
+        """
+        Plays the engine's move once its search has finished, otherwise checks again shortly. If the search failed,
+        the game ends.
+        """
+        try:
+            result: Optional[SearchResult] = self.search.poll()
+        except Exception as error:
+            self.search = None
+            print(f"ENGINE ERROR: {error!r}")
+            self.end_game()
+            return
+        if result is None:
+            self.display.root.after(ENGINE_POLL_MS, self.poll_engine)
+            return
+        self.search = None
+        self.last_result = result
+        player: Player = self.player_to_move
+        if result.best_move is None:
+            self.state = State.GAME_OVER
+            return
+        print(f"Engine: {result}")
+        self.play_engine_move(player, result.best_move)
+
+    def play_engine_move(self, player: Player, move: Move) -> None:
+        """
+        Plays the engine's move, shows it after a short delay and hands the move to the opponent.
+        :param player: the engine's player
+        :param move: the move, from the search or the opening book
+        """
+        piece = self.board.square_list[move.origin].get_occupant()
+        # the engine's move comes from the legal move generator and carries its own promotion piece
+        player.apply_move(move)
+        self.display.root.after(ENGINE_MOVE_DELAY_MS, self.display.update_display)
+        print(f"{player.color}: {piece} from {move.origin_id()} to {move.target_id()}")
+        self.finish_move(player)
+
+    def finish_move(self, player: Player) -> None:
+        """
+        Completes a player's move: reports check, checkmate, stalemate and draws, and hands the move to the opponent.
+        :param player: the player who just moved
+        """
+        opponent: Player = player.opponent
+        name: str = str(opponent.color).upper()
+        draw_reason: Optional[str] = opponent.draw_reason()
+        if opponent.is_in_checkmate():
+            print(f"{name} IS IN CHECKMATE")
+            self.end_game()
+        elif opponent.is_in_stalemate():
+            print("STALEMATE")
+            self.end_game()
+        elif draw_reason is not None:
+            print(f"DRAW BY {draw_reason.upper()}")
+            self.end_game()
+        else:
+            if opponent.is_in_check():
+                print(f"{name} IS IN CHECK")
+            print(f"{opponent.color}'s turn")
+            self.begin_turn(opponent)
+
+    def stop_pondering(self) -> None:
+        """
+        Cancels the engine's search on the opponent's time, if it is running.
+        """
+        if self.ponder is not None:
+            self.ponder.cancel()
+            self.ponder = None
+
+    def end_game(self) -> None:
+        """
+        Ends the game; further clicks are ignored.
+        """
+        self.stop_pondering()
+        self.state = State.GAME_OVER
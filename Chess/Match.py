@@ -0,0 +1,223 @@
+"""
+Headless matches between two move-selection policies, e.g. a random mover against the search engine, played in
+parallel over a process pool. Used to regression-test engine strength and speed.
+
+Usage (from the Chess directory):
+    python Match.py                                   100 games, engine (depth 2) against random moves
+    python Match.py --games 1000 --workers 8 --depth 3
+    python Match.py --nodes 5000 --opponent engine --opponent-depth 1
+"""
+import argparse
+import multiprocessing
+import random
+import time
+from typing import Optional
+from Engine import Engine
+from Fen import STARTING_FEN, new_game
+from Move import Move
+from Player import Player
+
+WIN, DRAW, LOSS = "win", "draw", "loss"
+
+
+class RandomPolicy:
+    """
+    Plays a uniformly random legal move.
+    """
+    name: str = "random"
+
+    def start_game(self) -> None:
+        """
+        Prepares for a new game.
+        """
+        pass
+
+    def choose(self, player: Player, rng: random.Random) -> Optional[Move]:
+        """
+        Chooses a move.
+        :param player: the player to move
+        :param rng: random number generator of the game
+        :return: the chosen move, or None if the player has no legal move
+        """
+        moves: list[Move] = player.legal_moves()
+        return rng.choice(moves) if moves else None
+
+
+class EnginePolicy:
+    def __init__(self, max_depth: int = 2, max_nodes: Optional[int] = None, max_time: Optional[float] = None,
+                 tt_size_mb: int = 4):
+        """
+        Constructs a new EnginePolicy, which plays the engine's best move.
+        :param max_depth: maximum depth of each search
+        :param max_nodes: node budget of each search (None for no limit)
+        :param max_time: time budget of each search in seconds (None for no limit)
+        :param tt_size_mb: size of the engine's transposition table in megabytes
+        """
+        self.max_depth: int = max_depth
+        self.max_nodes: Optional[int] = max_nodes
+        self.max_time: Optional[float] = max_time
+        self.tt_size_mb: int = tt_size_mb
+        self.engine: Optional[Engine] = None
+        self.name: str = f"engine(depth {max_depth}" + (f", {max_nodes} nodes)" if max_nodes else ")")
+
+    def start_game(self) -> None:
+        """
+        Prepares for a new game with a fresh engine, so that no game depends on the ones played before it.
+        """
+        self.engine = Engine(self.tt_size_mb)
+
+    def choose(self, player: Player, rng: random.Random) -> Optional[Move]:
+        """
+        Chooses a move.
+        :param player: the player to move
+        :param rng: random number generator of the game (unused; the search is deterministic)
+        :return: the chosen move, or None if the player has no legal move
+        """
+        return self.engine.search(player, self.max_time, self.max_nodes, self.max_depth).best_move
+
+    def __getstate__(self) -> dict:
+        # the engine (and its table) is created in the process that plays the game, never pickled
+        state: dict = self.__dict__.copy()
+        state["engine"] = None
+        return state
+
+
+class GameResult:
+    def __init__(self, number: int, result: str, reason: str, plies: int):
+        """
+        Constructs a new GameResult.
+        :param number: number of the game in the match
+        :param result: "1-0", "0-1" or "1/2-1/2"
+        :param reason: how the game ended (e.g. "checkmate", "stalemate", "threefold repetition", "move limit")
+        :param plies: number of moves played
+        """
+        self.number: int = number
+        self.result: str = result
+        self.reason: str = reason
+        self.plies: int = plies
+
+
+def play_game(number: int, white_policy, black_policy, seed: int = 0, max_plies: int = 400,
+              fen: str = STARTING_FEN) -> GameResult:
+    """
+    Plays one game between two policies. Promotions come from the move generator with their piece already chosen,
+    so no one is ever asked for input.
+    :param number: number of the game in the match
+    :param white_policy: policy choosing white's moves
+    :param black_policy: policy choosing black's moves
+    :param seed: seed of the match; each game's random numbers depend on it and the game number only
+    :param max_plies: number of moves after which the game is adjudicated a draw (a game normally ends before by
+                      repetition, the fifty-move rule or insufficient material)
+    :param fen: starting position
+    :return: the result of the game
+    """
+    rng: random.Random = random.Random(seed * 1_000_003 + number)
+    white, black = new_game(fen)
+    player: Player = white if white.board.turn is white.color else black
+    white_policy.start_game()
+    black_policy.start_game()
+
+    for ply in range(max_plies):
+        reason: Optional[str] = player.draw_reason()
+        if reason is not None:
+            return GameResult(number, "1/2-1/2", reason, ply)
+        policy = white_policy if player.is_white() else black_policy
+        move: Optional[Move] = policy.choose(player, rng)
+        if move is None:
+            if player.is_in_check():
+                return GameResult(number, "0-1" if player.is_white() else "1-0", "checkmate", ply)
+            return GameResult(number, "1/2-1/2", "stalemate", ply)
+        player.apply_move(move)
+        player = player.opponent
+    return GameResult(number, "1/2-1/2", "move limit", max_plies)
+
+
+def play_match_game(job: tuple) -> tuple[GameResult, bool]:
+    """
+    Plays one game of a match. Policy A plays white in even-numbered games and black in odd-numbered ones.
+    :param job: (game number, policy A, policy B, seed, max plies)
+    :return: (the game result, whether policy A played white)
+    """
+    number, policy_a, policy_b, seed, max_plies = job
+    a_is_white: bool = number % 2 == 0
+    white_policy, black_policy = (policy_a, policy_b) if a_is_white else (policy_b, policy_a)
+    return play_game(number, white_policy, black_policy, seed, max_plies), a_is_white
+
+
+def outcome(result: GameResult, a_is_white: bool) -> str:
+    """
+    Converts a game result into WIN, DRAW or LOSS for policy A.
+    :param result: the game result
+    :param a_is_white: whether policy A played white
+    :return: WIN, DRAW or LOSS
+    """
+    if result.result == "1/2-1/2":
+        return DRAW
+    return WIN if (result.result == "1-0") == a_is_white else LOSS
+
+
+def run_match(policy_a, policy_b, games: int, workers: int = 1, seed: int = 0, max_plies: int = 400,
+              verbose: bool = False) -> dict[str, int]:
+    """
+    Plays a match between two policies, alternating colors, and prints the score and speed.
+    :param policy_a: the first policy
+    :param policy_b: the second policy
+    :param games: number of games
+    :param workers: number of processes (1 plays in this process)
+    :param seed: seed of the match
+    :param max_plies: number of moves after which a game is adjudicated a draw
+    :param verbose: whether to print every game's result
+    :return: dictionary with the number of wins, draws and losses of policy A
+    """
+    jobs = [(number, policy_a, policy_b, seed, max_plies) for number in range(games)]
+    counts: dict[str, int] = {WIN: 0, DRAW: 0, LOSS: 0}
+    plies: int = 0
+    start: float = time.perf_counter()
+    if workers <= 1:
+        results = map(play_match_game, jobs)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(play_match_game, jobs)
+    try:
+        for result, a_is_white in results:
+            counts[outcome(result, a_is_white)] += 1
+            plies += result.plies
+            if verbose:
+                white_name: str = policy_a.name if a_is_white else policy_b.name
+                black_name: str = policy_b.name if a_is_white else policy_a.name
+                print(f"game {result.number}: {white_name} - {black_name} {result.result} ({result.reason}, "
+                      f"{result.plies} plies)")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    elapsed: float = time.perf_counter() - start
+
+    games_per_second: float = games / elapsed if elapsed > 0 else 0.0
+    print(f"{policy_a.name} vs {policy_b.name}: +{counts[WIN]} ={counts[DRAW]} -{counts[LOSS]}  "
+          f"{games} games  {plies} plies  {elapsed:.2f}s  {games_per_second:.2f} games/s")
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play a headless match between the engine and another policy.")
+    parser.add_argument("--games", type=int, default=100, help="number of games (default 100)")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes (default 1)")
+    parser.add_argument("--depth", type=int, default=2, help="engine search depth (default 2)")
+    parser.add_argument("--nodes", type=int, help="engine node budget per move")
+    parser.add_argument("--opponent", choices=["random", "engine"], default="random",
+                        help="policy of the opponent (default random)")
+    parser.add_argument("--opponent-depth", type=int, default=1, help="search depth of an engine opponent")
+    parser.add_argument("--max-plies", type=int, default=400, help="moves before a game is drawn (default 400)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random moves (default 0)")
+    parser.add_argument("--verbose", action="store_true", help="print the result of every game")
+    args = parser.parse_args()
+
+    policy_a = EnginePolicy(args.depth, args.nodes)
+    policy_b = RandomPolicy() if args.opponent == "random" else EnginePolicy(args.opponent_depth)
+    run_match(policy_a, policy_b, args.games, args.workers, args.seed, args.max_plies, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from typing import Optional
+from Bitboard import SQUARE_NAMES
+
+# Move flags
+NORMAL, DOUBLE_PUSH, EN_PASSANT, CASTLE = range(4)
+
+# letters used for promotion pieces in move strings, indexed by piece kind
+PROMOTION_LETTERS: list[str] = ["", "n", "b", "r", "q", ""]
+
+
+class Move:
+    __slots__ = ("origin", "target", "flag", "promotion")
+
+    def __init__(self, origin: int, target: int, flag: int = NORMAL, promotion: Optional[int] = None):
+        """
+        Constructs a new Move.
+        :param origin: index (0-63) of the origin square
+        :param target: index (0-63) of the target square
+        :param flag: NORMAL, DOUBLE_PUSH, EN_PASSANT or CASTLE
+        :param promotion: piece kind a pawn promotes to, or None
+        """
+        self.origin: int = origin
+        self.target: int = target
+        self.flag: int = flag
+        self.promotion: Optional[int] = promotion
+
+    def origin_id(self) -> str:
+        """
+        Returns the string identifier of the origin square (e.g. "e2").
+        :return: the origin square identifier
+        """
+        return SQUARE_NAMES[self.origin]
+
+    def target_id(self) -> str:
+        """
+        Returns the string identifier of the target square (e.g. "e4").
+        :return: the target square identifier
+        """
+        return SQUARE_NAMES[self.target]
+
+    def encode(self) -> int:
+        """
+        Packs this move into a 15-bit integer: origin in bits 0-5, target in bits 6-11 and the promotion kind
+        (0 for none) in bits 12-14. The flag is not stored; it follows from the position the move is played in.
+        :return: the packed move
+        """
+        promotion: int = 0 if self.promotion is None else self.promotion
+        return self.origin | self.target << 6 | promotion << 12
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Move) and self.origin == other.origin and self.target == other.target and
+                self.promotion == other.promotion)
+
+    def __hash__(self) -> int:
+        return hash((self.origin, self.target, self.promotion))
+
+    def __str__(self) -> str:
+        """
+        Returns the move in coordinate notation, e.g. "e2e4" or "e7e8q".
+        :return: the move in coordinate notation
+        """
+        letter: str = "" if self.promotion is None else PROMOTION_LETTERS[self.promotion]
+        return f"{SQUARE_NAMES[self.origin]}{SQUARE_NAMES[self.target]}{letter}"
+
+    def __repr__(self) -> str:
+        return f"Move({self})"
@@ -0,0 +1,229 @@
+"""
+Move generation from the board's bitboards.
+
+Only reachable targets are produced: offset tables for knights and kings, rays that stop at the first blocker for
+sliding pieces, and pushes/captures for pawns. generate_moves() returns pseudo-legal moves, which may leave the
+mover's king in check; generate_legal_moves() filters those out using pin and check masks computed once per position.
+"""
+from Bitboard import (FULL, RANK_OF, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, BETWEEN, LINE, squares_of, lowest_square,
+                      rook_attacks, bishop_attacks)
+from Chess.Piece import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from Move import Move, NORMAL, DOUBLE_PUSH, EN_PASSANT, CASTLE
+
+PROMOTION_KINDS: list[int] = [QUEEN, ROOK, BISHOP, KNIGHT]
+
+
+def add_pawn_moves(moves: list[Move], player: 'Player', origins: int, targets: int = FULL,
+                   en_passant: bool = True) -> None:
+    """
+    Appends the pseudo-legal pawn pushes, captures, en passant captures and promotions of a player.
+    :param moves: list the moves are appended to
+    :param player: player to move
+    :param origins: bitboard of the pawns to generate moves for
+    :param targets: bitboard restricting the target squares of pushes and captures
+    :param en_passant: whether to generate en passant captures
+    """
+    board = player.board
+    us: int = player.color.value
+    enemy: int = board.color_masks[us ^ 1]
+    empty: int = ~board.occupied
+    forward: int = 8 if us == 0 else -8
+    start_rank: int = 1 if us == 0 else 6
+    last_rank: int = 7 if us == 0 else 0
+    en_passant_square = board.en_passant_square if en_passant else None
+
+    for origin in squares_of(board.piece_masks[us][PAWN] & origins):
+        one_step: int = origin + forward
+        destinations: int = PAWN_ATTACKS[us][origin] & enemy
+        if empty >> one_step & 1:
+            destinations |= 1 << one_step
+            two_step: int = one_step + forward
+            if RANK_OF[origin] == start_rank and empty >> two_step & 1 and targets >> two_step & 1:
+                moves.append(Move(origin, two_step, DOUBLE_PUSH))
+        for target in squares_of(destinations & targets):
+            if RANK_OF[target] == last_rank:
+                for kind in PROMOTION_KINDS:
+                    moves.append(Move(origin, target, NORMAL, kind))
+            else:
+                moves.append(Move(origin, target))
+        if en_passant_square is not None and PAWN_ATTACKS[us][origin] >> en_passant_square & 1:
+            moves.append(Move(origin, en_passant_square, EN_PASSANT))
+
+
+def add_piece_moves(moves: list[Move], player: 'Player', origins: int, targets: int) -> None:
+    """
+    Appends the moves of a player's knights, bishops, rooks and queens.
+    :param moves: list the moves are appended to
+    :param player: player to move
+    :param origins: bitboard of the pieces to generate moves for
+    :param targets: bitboard of allowed target squares (should exclude the player's own pieces)
+    """
+    board = player.board
+    masks: list[int] = board.piece_masks[player.color.value]
+    occupied: int = board.occupied
+
+    for origin in squares_of(masks[KNIGHT] & origins):
+        for target in squares_of(KNIGHT_ATTACKS[origin] & targets):
+            moves.append(Move(origin, target))
+    for origin in squares_of((masks[BISHOP] | masks[QUEEN]) & origins):
+        for target in squares_of(bishop_attacks(origin, occupied) & targets):
+            moves.append(Move(origin, target))
+    for origin in squares_of((masks[ROOK] | masks[QUEEN]) & origins):
+        for target in squares_of(rook_attacks(origin, occupied) & targets):
+            moves.append(Move(origin, target))
+
+
+def add_castling_moves(moves: list[Move], player: 'Player') -> None:
+    """
+    Appends the castling moves available to a player. Castling requires an unmoved king and rook, empty squares
+    between them, and that the king is not in check and does not pass through or land on an attacked square.
+    :param moves: list the moves are appended to
+    :param player: player to move
+    """
+    board = player.board
+    king = player.king
+    if king is None or king.has_moved() or not king.is_on_square():
+        return
+    king_index: int = king.get_position().index
+    if king_index != (4 if player.is_white() else 60):
+        return
+    opponent_color = player.opponent.color
+    if board.is_attacked(king_index, opponent_color):
+        return
+
+    # (rook square, squares the king passes over and lands on)
+    for rook_index, king_path in [(king_index + 3, [king_index + 1, king_index + 2]),
+                                  (king_index - 4, [king_index - 1, king_index - 2])]:
+        rook = board.square_list[rook_index].occupant
+        if rook is None or rook.kind != ROOK or rook.color is not player.color or rook.has_moved():
+            continue
+        if BETWEEN[king_index][rook_index] & board.occupied:
+            continue
+        if any(board.is_attacked(index, opponent_color) for index in king_path):
+            continue
+        moves.append(Move(king_index, king_path[1], CASTLE))
+
+
+def generate_moves(player: 'Player', origins: int = FULL) -> list[Move]:
+    """
+    Generates the pseudo-legal moves of a player.
+    :param player: player to move
+    :param origins: bitboard restricting which of the player's pieces to generate moves for
+    :return: list of pseudo-legal moves
+    """
+    board = player.board
+    us: int = player.color.value
+    not_own: int = ~board.color_masks[us]
+    moves: list[Move] = []
+
+    add_pawn_moves(moves, player, origins)
+    add_piece_moves(moves, player, origins, not_own)
+    for origin in squares_of(board.piece_masks[us][KING] & origins):
+        for target in squares_of(KING_ATTACKS[origin] & not_own):
+            moves.append(Move(origin, target))
+        add_castling_moves(moves, player)
+    return moves
+
+
+def pinned_pieces(player: 'Player', king_index: int) -> dict[int, int]:
+    """
+    Finds the player's pieces that are pinned to their king.
+    :param player: player whose pinned pieces to find
+    :param king_index: square index of the player's king
+    :return: dictionary mapping the square of each pinned piece to the line it may still move along
+    """
+    board = player.board
+    us: int = player.color.value
+    enemy_masks: list[int] = board.piece_masks[us ^ 1]
+    snipers: int = ((rook_attacks(king_index, 0) & (enemy_masks[ROOK] | enemy_masks[QUEEN])) |
+                    (bishop_attacks(king_index, 0) & (enemy_masks[BISHOP] | enemy_masks[QUEEN])))
+    pins: dict[int, int] = {}
+    for sniper in squares_of(snipers):
+        blockers: int = BETWEEN[king_index][sniper] & board.occupied
+        # exactly one piece between the king and the sniper, and it is ours
+        if blockers and not blockers & (blockers - 1) and blockers & board.color_masks[us]:
+            pins[lowest_square(blockers)] = LINE[king_index][sniper]
+    return pins
+
+
+def is_legal_en_passant(player: 'Player', move: Move, king_index: int) -> bool:
+    """
+    Checks whether an en passant capture leaves the king safe. En passant removes two pieces from one rank, so it is
+    tested directly against the occupancy after the capture instead of with the pin and check masks.
+    :param player: player to move
+    :param move: the en passant move
+    :param king_index: square index of the player's king
+    :return: True if the king is not attacked after the capture
+    """
+    board = player.board
+    captured: int = move.target - 8 if player.is_white() else move.target + 8
+    occupied: int = (board.occupied & ~(1 << move.origin) & ~(1 << captured)) | 1 << move.target
+    attackers: int = board.attackers_to(king_index, player.opponent.color, occupied)
+    return not attackers & ~(1 << captured)
+
+
+def generate_legal_moves(player: 'Player', origins: int = FULL) -> list[Move]:
+    """
+    Generates the legal moves of a player, i.e. the pseudo-legal moves that do not leave their king in check.
+    Checking pieces, pinned pieces and the block/capture mask are computed once per position, so no move has to be
+    made to test it.
+    :param player: player to move
+    :param origins: bitboard restricting which of the player's pieces to generate moves for
+    :return: list of legal moves
+    """
+    board = player.board
+    us: int = player.color.value
+    king_mask: int = board.piece_masks[us][KING]
+    if not king_mask:
+        return generate_moves(player, origins)
+    king_index: int = lowest_square(king_mask)
+    opponent_color = player.opponent.color
+    not_own: int = ~board.color_masks[us]
+    moves: list[Move] = []
+
+    in_check: bool = board.is_attacked(king_index, opponent_color)
+
+    # the king may go to any square that is not attacked. Out of check the attack map answers that directly; in check
+    # a slider's ray continues behind the king once it moves, so those squares are tested without the king
+    if origins & king_mask:
+        king_targets: int = KING_ATTACKS[king_index] & not_own
+        if not in_check:
+            for target in squares_of(king_targets & ~board.attacked[opponent_color.value]):
+                moves.append(Move(king_index, target))
+        else:
+            without_king: int = board.occupied & ~king_mask
+            for target in squares_of(king_targets):
+                if not board.attackers_to(target, opponent_color, without_king):
+                    moves.append(Move(king_index, target))
+
+    checkers: int = board.attackers_to(king_index, opponent_color) if in_check else 0
+    if checkers & (checkers - 1):
+        # double check: only the king can move
+        return moves
+    if checkers:
+        # the other pieces must capture the checking piece or block its ray
+        check_mask: int = checkers | BETWEEN[king_index][lowest_square(checkers)]
+    else:
+        check_mask: int = FULL
+        if origins & king_mask:
+            add_castling_moves(moves, player)
+
+    pins: dict[int, int] = pinned_pieces(player, king_index)
+    pinned: int = 0
+    for index in pins:
+        pinned |= 1 << index
+    free: int = origins & ~pinned & ~king_mask
+    add_pawn_moves(moves, player, free, check_mask, en_passant=False)
+    add_piece_moves(moves, player, free, not_own & check_mask)
+    for index in squares_of(origins & pinned):
+        targets: int = check_mask & pins[index]
+        add_pawn_moves(moves, player, 1 << index, targets, en_passant=False)
+        add_piece_moves(moves, player, 1 << index, not_own & targets)
+
+    if board.en_passant_square is not None:
+        en_passant_moves: list[Move] = []
+        add_pawn_moves(en_passant_moves, player, origins, 0)
+        for move in en_passant_moves:
+            if is_legal_en_passant(player, move, king_index):
+                moves.append(move)
+    return moves
@@ -0,0 +1,179 @@
+"""
+Opening book in a Polyglot-style binary file: a sequence of 16-byte big-endian entries (position key: 8 bytes,
+move: 2 bytes, weight: 2 bytes, learn: 4 bytes), sorted by key. The file is memory-mapped and binary-searched, so
+opening a book takes constant time and memory whatever its size.
+
+The layout and move encoding follow Polyglot (target in bits 0-5, origin in bits 6-11, promotion kind in bits 12-14,
+castling written as the king capturing its own rook), but positions are keyed with this project's Zobrist key
+(Board.key), not Polyglot's random numbers, so Polyglot books cannot be read and our books cannot be used elsewhere.
+
+Usage (from the Chess directory):
+    python OpeningBook.py build assets/openings.pgn assets/book.bin --plies 16
+    python OpeningBook.py probe assets/book.bin --fen "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+"""
+import argparse
+import mmap
+import os
+import random
+import struct
+from typing import Optional
+from Fen import STARTING_FEN, load_fen
+from Move import Move, CASTLE
+from Pgn import read_games, parse_san
+from Player import Player
+
+ENTRY_SIZE: int = 16
+ENTRY_FORMAT: struct.Struct = struct.Struct(">QHHI")
+KEY_FORMAT: struct.Struct = struct.Struct(">Q")
+MAX_WEIGHT: int = 0xFFFF
+
+
+def encode_book_move(move: Move) -> int:
+    """
+    Packs a move the way Polyglot books do.
+    :param move: the move
+    :return: the 16-bit book move
+    """
+    target: int = move.target
+    if move.flag == CASTLE:
+        # castling is stored as the king moving onto its rook's corner
+        target = move.origin + 3 if move.target > move.origin else move.origin - 4
+    promotion: int = 0 if move.promotion is None else move.promotion
+    return target | move.origin << 6 | promotion << 12
+
+
+class OpeningBook:
+    def __init__(self, path: str):
+        """
+        Opens a book file. Nothing is read until the book is probed.
+        :param path: path of the book file
+        """
+        self.path: str = path
+        self.file = open(path, "rb")
+        size: int = os.fstat(self.file.fileno()).st_size
+        self.entry_count: int = size // ENTRY_SIZE
+        # an empty file cannot be mapped, but it is a valid (empty) book
+        self.data: Optional[mmap.mmap] = None
+        if self.entry_count:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """
+        Closes the book file.
+        """
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+        self.file.close()
+
+    def entries(self, key: int) -> list[tuple[int, int]]:
+        """
+        Finds the book moves of a position by binary search.
+        :param key: Zobrist key of the position
+        :return: list of (book move, weight) pairs, empty if the position is not in the book
+        """
+        if self.data is None:
+            return []
+        low: int = 0
+        high: int = self.entry_count
+        while low < high:
+            middle: int = (low + high) // 2
+            if KEY_FORMAT.unpack_from(self.data, middle * ENTRY_SIZE)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        found: list[tuple[int, int]] = []
+        while low < self.entry_count:
+            entry_key, book_move, weight, _ = ENTRY_FORMAT.unpack_from(self.data, low * ENTRY_SIZE)
+            if entry_key != key:
+                break
+            found.append((book_move, weight))
+            low += 1
+        return found
+
+    def moves(self, player: Player) -> list[tuple[Move, int]]:
+        """
+        Returns the book moves of a position that are legal in it, so a key collision can never produce an illegal
+        move.
+        :param player: the player to move
+        :return: list of (move, weight) pairs
+        """
+        entries: list[tuple[int, int]] = self.entries(player.board.key)
+        if not entries:
+            return []
+        legal: dict[int, Move] = {encode_book_move(move): move for move in player.legal_moves()}
+        return [(legal[book_move], weight) for book_move, weight in entries if book_move in legal and weight > 0]
+
+    def choose(self, player: Player, rng: Optional[random.Random] = None) -> Optional[Move]:
+        """
+        Picks a book move at random, each with a probability proportional to its weight.
+        :param player: the player to move
+        :param rng: random number generator to use (the random module's by default)
+        :return: the chosen move, or None if the position is not in the book
+        """
+        candidates: list[tuple[Move, int]] = self.moves(player)
+        if not candidates:
+            return None
+        rng = rng or random
+        moves, weights = zip(*candidates)
+        return rng.choices(moves, weights=weights)[0]
+
+
+def build_book(pgn_path: str, book_path: str, max_plies: int = 16) -> int:
+    """
+    Builds a book from the opening moves of the games in a PGN file. Each move is weighted by the number of games
+    that played it in that position.
+    :param pgn_path: the PGN file to read
+    :param book_path: the book file to write
+    :param max_plies: number of moves of each game to add
+    :return: number of entries written
+    """
+    counts: dict[tuple[int, int], int] = {}
+    with open(pgn_path, encoding="utf-8", errors="replace") as file:
+        for game in read_games(file):
+            player: Player = load_fen(game.tags.get("FEN", STARTING_FEN))
+            for san in game.moves[:max_plies]:
+                move: Optional[Move] = parse_san(player, san)
+                if move is None:
+                    break
+                entry: tuple[int, int] = (player.board.key, encode_book_move(move))
+                counts[entry] = counts.get(entry, 0) + 1
+                player.apply_move(move)
+                player = player.opponent
+
+    # sorted by key, and within a position by weight so the most played move comes first
+    entries = sorted(counts.items(), key=lambda item: (item[0][0], -item[1]))
+    with open(book_path, "wb") as file:
+        for (key, book_move), count in entries:
+            file.write(ENTRY_FORMAT.pack(key, book_move, min(count, MAX_WEIGHT), 0))
+    return len(entries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or probe an opening book.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build a book from a PGN file")
+    build.add_argument("pgn", help="PGN file to read")
+    build.add_argument("book", help="book file to write")
+    build.add_argument("--plies", type=int, default=16, help="moves of each game to add (default 16)")
+    probe = commands.add_parser("probe", help="list the book moves of a position")
+    probe.add_argument("book", help="book file to read")
+    probe.add_argument("--fen", default=STARTING_FEN, help="the position (default: the starting position)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(f"{build_book(args.pgn, args.book, args.plies)} entries written to {args.book}")
+    else:
+        book: OpeningBook = OpeningBook(args.book)
+        player: Player = load_fen(args.fen)
+        candidates: list[tuple[Move, int]] = book.moves(player)
+        total: int = sum(weight for _, weight in candidates)
+        for move, weight in candidates:
+            print(f"{move}  weight {weight}  ({100 * weight / total:.0f}%)")
+        if not candidates:
+            print("position not in book")
+        book.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Fixed-size cache of pawn structure scores keyed by the board's pawn key, the Zobrist key of the pawns alone.
+
+Pawns move rarely compared to the other pieces, so most positions in a search share their pawn skeleton with many
+others. Their doubled, isolated, passed and backward pawn scores are computed once per skeleton and then read back
+from here. Each slot is replaced by the newest skeleton that hashes to it.
+"""
+from array import array
+from typing import Optional
+
+
+class PawnHashTable:
+    def __init__(self, size_kb: int = 256):
+        """
+        Constructs a new PawnHashTable.
+        :param size_kb: size of the table in kilobytes
+        """
+        # each entry is a 64-bit key plus the middlegame and endgame scores as 32-bit integers
+        self.entry_count: int = max(1, size_kb * 1024 // 16)
+        self.keys = array('Q', bytes(self.entry_count * 8))
+        self.scores = array('i', bytes(self.entry_count * 8))
+        self.filled = array('b', bytes(self.entry_count))
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def clear(self) -> None:
+        """
+        Empties the table and resets the counters.
+        """
+        for index in range(self.entry_count):
+            self.filled[index] = 0
+        self.hits = 0
+        self.misses = 0
+
+    def probe(self, pawn_key: int) -> Optional[tuple[int, int]]:
+        """
+        Looks up the scores of a pawn skeleton.
+        :param pawn_key: pawn key of the position
+        :return: (middlegame, endgame) score if the skeleton is stored, otherwise None
+        """
+        slot: int = pawn_key % self.entry_count
+        if self.filled[slot] and self.keys[slot] == pawn_key:
+            self.hits += 1
+            return self.scores[2 * slot], self.scores[2 * slot + 1]
+        self.misses += 1
+        return None
+
+    def store(self, pawn_key: int, mg: int, eg: int) -> None:
+        """
+        Stores the scores of a pawn skeleton.
+        :param pawn_key: pawn key of the position
+        :param mg: middlegame pawn structure score
+        :param eg: endgame pawn structure score
+        """
+        slot: int = pawn_key % self.entry_count
+        self.keys[slot] = pawn_key
+        self.scores[2 * slot] = mg
+        self.scores[2 * slot + 1] = eg
+        self.filled[slot] = 1
+
+    def hit_rate(self) -> float:
+        """
+        Returns the share of probes that found their skeleton.
+        :return: hits divided by probes (0.0 before the first probe)
+        """
+        probes: int = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def stats(self) -> dict[str, float]:
+        """
+        Returns the table's counters.
+        :return: dictionary with the hits, misses and hit rate of the table
+        """
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate()}
@@ -0,0 +1,124 @@
+"""
+Perft: counts the leaf nodes of the legal move tree to a fixed depth and compares them with published reference
+counts, which checks the move generator for rule correctness and measures its speed.
+
+Usage (from the Chess directory):
+    python Perft.py                          run every reference position to depth 3
+    python Perft.py --depth 4 --position kiwipete --divide
+    python Perft.py --fen "8/8/8/8/8/8/8/K6k w - - 0 1" --depth 5
+"""
+import argparse
+import sys
+import time
+from typing import Optional
+from Fen import STARTING_FEN, load_fen
+from Player import Player
+
+# name: (FEN, reference node counts for depth 1, 2, 3, ...)
+POSITIONS: dict[str, tuple[str, list[int]]] = {
+    "start": (STARTING_FEN,
+              [20, 400, 8902, 197281, 4865609]),
+    "kiwipete": ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                 [48, 2039, 97862, 4085603]),
+    "position3": ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+                  [14, 191, 2812, 43238, 674624]),
+    "position4": ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+                  [6, 264, 9467, 422333]),
+    "position5": ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+                  [44, 1486, 62379, 2103487]),
+    "position6": ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+                  [46, 2079, 89890, 3894594]),
+}
+
+
+def perft(player: Player, depth: int) -> int:
+    """
+    Counts the leaf nodes of the legal move tree below the current position.
+    :param player: the player to move
+    :param depth: number of plies to search
+    :return: number of leaf nodes
+    """
+    moves = player.legal_moves()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes: int = 0
+    for move in moves:
+        player.apply_move(move)
+        nodes += perft(player.opponent, depth - 1)
+        player.unmake_move()
+    return nodes
+
+
+def divide(player: Player, depth: int) -> dict[str, int]:
+    """
+    Counts the leaf nodes below each root move separately.
+    :param player: the player to move
+    :param depth: number of plies to search (including the root move)
+    :return: dictionary mapping each root move (e.g. "e2e4") to its leaf node count
+    """
+    counts: dict[str, int] = {}
+    for move in player.legal_moves():
+        player.apply_move(move)
+        counts[str(move)] = perft(player.opponent, depth - 1)
+        player.unmake_move()
+    return counts
+
+
+def run(name: str, fen: str, depth: int, expected: Optional[int], show_divide: bool) -> bool:
+    """
+    Runs perft on one position and prints the node count, speed and result of the reference comparison.
+    :param name: name of the position
+    :param fen: the position in Forsyth-Edwards Notation
+    :param depth: number of plies to search
+    :param expected: reference node count, or None if unknown
+    :param show_divide: whether to print the node count of each root move
+    :return: False if the node count differs from the reference count, otherwise True
+    """
+    player: Player = load_fen(fen)
+    start: float = time.perf_counter()
+    if show_divide:
+        counts: dict[str, int] = divide(player, depth)
+        for move in sorted(counts):
+            print(f"  {move}: {counts[move]}")
+        nodes: int = sum(counts.values())
+    else:
+        nodes: int = perft(player, depth)
+    elapsed: float = time.perf_counter() - start
+
+    if expected is None:
+        verdict: str = ""
+    elif nodes == expected:
+        verdict = "OK"
+    else:
+        verdict = f"FAIL (expected {expected})"
+    nodes_per_second: float = nodes / elapsed if elapsed > 0 else 0.0
+    print(f"{name:<10} depth {depth}  {nodes:>10} nodes  {elapsed:8.2f}s  {nodes_per_second:>10.0f} nps  {verdict}")
+    return expected is None or nodes == expected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Count move tree leaf nodes and check them against references.")
+    parser.add_argument("--depth", type=int, default=3, help="number of plies to search (default 3)")
+    parser.add_argument("--position", choices=sorted(POSITIONS), help="run a single reference position")
+    parser.add_argument("--fen", help="run a custom position given in FEN")
+    parser.add_argument("--divide", action="store_true", help="print the node count of every root move")
+    args = parser.parse_args()
+
+    if args.fen:
+        jobs = [("custom", args.fen, None)]
+    else:
+        names = [args.position] if args.position else list(POSITIONS)
+        jobs = []
+        for name in names:
+            fen, references = POSITIONS[name]
+            expected = references[args.depth - 1] if args.depth <= len(references) else None
+            jobs.append((name, fen, expected))
+
+    passed: bool = True
+    for name, fen, expected in jobs:
+        passed = run(name, fen, args.depth, expected, args.divide) and passed
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
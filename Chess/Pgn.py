@@ -0,0 +1,245 @@
+"""
+Portable Game Notation (PGN): a streaming reader for game archives and a replayer that checks every move against the
+legal move generator.
+
+Games are read one at a time from a line iterator, so an archive of any size is processed in constant memory. Moves in
+Standard Algebraic Notation (SAN) are resolved by matching them against Player.legal_moves(); a move that matches no
+legal move, or more than one, is reported as rejected. Replaying can be spread over a process pool.
+
+Usage (from the Chess directory):
+    python Pgn.py games.pgn
+    python Pgn.py games.pgn --workers 8 --progress 10000
+"""
+import argparse
+import itertools
+import multiprocessing
+import re
+import sys
+import time
+from typing import Iterable, Iterator, Optional
+from Bitboard import SQUARE_INDICES, FILE_OF, RANK_OF
+from Fen import STARTING_FEN, KIND_LETTERS, load_fen, to_fen
+from Move import Move, CASTLE
+from Player import Player
+from Chess.Piece import PAWN
+
+RESULTS: set[str] = {"1-0", "0-1", "1/2-1/2", "*"}
+TAG_RE = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$')
+# brace comments, rest-of-line comments, variation parentheses, numeric annotation glyphs and everything else
+TOKEN_RE = re.compile(r"\{[^}]*\}|;[^\n]*|[()]|\$\d+|[^\s(){};]+")
+MOVE_NUMBER_RE = re.compile(r"^\d+\.+")
+SAN_RE = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$")
+# games handed to the process pool at a time, so that reading never runs far ahead of replaying
+BATCH_SIZE: int = 256
+
+
+class PgnGame:
+    def __init__(self, number: int, tags: dict[str, str], moves: list[str], result: Optional[str]):
+        """
+        Constructs a new PgnGame.
+        :param number: position of the game in its file, starting at 1
+        :param tags: the tag pairs (e.g. {"White": "...", "Result": "1-0"})
+        :param moves: the moves of the main line in SAN, without move numbers, comments or variations
+        :param result: the game termination marker ("1-0", "0-1", "1/2-1/2" or "*"), or None if missing
+        """
+        self.number: int = number
+        self.tags: dict[str, str] = tags
+        self.moves: list[str] = moves
+        self.result: Optional[str] = result
+
+
+class GameReport:
+    def __init__(self, number: int, plies: int, rejected_move: Optional[str] = None, rejected_ply: int = -1,
+                 fen: Optional[str] = None):
+        """
+        Constructs a new GameReport.
+        :param number: position of the game in its file, starting at 1
+        :param plies: number of moves replayed successfully
+        :param rejected_move: the first move that could not be replayed (None if the whole game was replayed)
+        :param rejected_ply: index of the rejected move in the game's move list
+        :param fen: the position in which the move was rejected
+        """
+        self.number: int = number
+        self.plies: int = plies
+        self.rejected_move: Optional[str] = rejected_move
+        self.rejected_ply: int = rejected_ply
+        self.fen: Optional[str] = fen
+
+    def __str__(self) -> str:
+        if self.rejected_move is None:
+            return f"game {self.number}: {self.plies} plies OK"
+        move_number: int = self.rejected_ply // 2 + 1
+        dots: str = "." if self.rejected_ply % 2 == 0 else "..."
+        return f"game {self.number}: move {move_number}{dots}{self.rejected_move} rejected in {self.fen}"
+
+
+def parse_movetext(movetext: str) -> tuple[list[str], Optional[str]]:
+    """
+    Extracts the main line moves and the result from a game's movetext.
+    :param movetext: the movetext of one game
+    :return: (moves in SAN, result marker or None)
+    """
+    moves: list[str] = []
+    result: Optional[str] = None
+    variation_depth: int = 0
+    for token in TOKEN_RE.findall(movetext):
+        if token == "(":
+            variation_depth += 1
+        elif token == ")":
+            variation_depth = max(0, variation_depth - 1)
+        elif variation_depth or token[0] in "{;$":
+            continue
+        elif token in RESULTS:
+            result = token
+        else:
+            # move numbers may be written apart ("12." / "12...") or joined to the move ("12.e4")
+            token = MOVE_NUMBER_RE.sub("", token)
+            if token:
+                moves.append(token)
+    return moves, result
+
+
+def read_games(lines: Iterable[str]) -> Iterator[PgnGame]:
+    """
+    Reads games one at a time from the lines of a PGN file.
+    :param lines: the lines of the file (e.g. an open file object)
+    :return: iterator over the games
+    """
+    number: int = 0
+    tags: dict[str, str] = {}
+    movetext: list[str] = []
+    comment_depth: int = 0
+    # set by the blank line that ends a tag section
+    tags_done: bool = False
+    for line in lines:
+        stripped: str = line.strip()
+        if comment_depth == 0 and stripped.startswith("["):
+            match = TAG_RE.match(stripped)
+            # a tag after movetext, after a finished tag section or repeating a tag starts the next game, so a game
+            # without movetext is still read (as a game of no moves) rather than lost
+            if movetext or tags_done or (match and match.group(1) in tags):
+                number += 1
+                yield PgnGame(number, tags, *parse_movetext("\n".join(movetext)))
+                tags = {}
+                movetext = []
+                tags_done = False
+            if match:
+                tags[match.group(1)] = match.group(2)
+        elif not stripped:
+            tags_done = bool(tags) and not movetext and comment_depth == 0
+        else:
+            movetext.append(stripped)
+            comment_depth = max(0, comment_depth + stripped.count("{") - stripped.count("}"))
+    if movetext or tags:
+        number += 1
+        yield PgnGame(number, tags, *parse_movetext("\n".join(movetext)))
+
+
+def parse_san(player: 'Player', san: str) -> Optional[Move]:
+    """
+    Finds the legal move written in Standard Algebraic Notation.
+    :param player: the player to move
+    :param san: the move (e.g. "Nbd7", "exd6", "e8=Q+", "O-O-O")
+    :return: the matching legal move, or None if no legal move or more than one matches
+    """
+    san = san.rstrip("+#!?")
+    moves: list[Move] = player.legal_moves()
+    if san in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        kingside: bool = len(san) == 3
+        for move in moves:
+            if move.flag == CASTLE and (move.target > move.origin) == kingside:
+                return move
+        return None
+
+    match = SAN_RE.match(san)
+    if match is None:
+        return None
+    piece_letter, from_file, from_rank, target, promotion_letter = match.groups()
+    kind: int = PAWN if piece_letter is None else KIND_LETTERS.index(piece_letter.lower())
+    target_index: int = SQUARE_INDICES[target]
+    promotion: Optional[int] = None if promotion_letter is None else KIND_LETTERS.index(promotion_letter.lower())
+    squares = player.board.square_list
+    candidates: list[Move] = [
+        move for move in moves
+        if move.target == target_index and move.promotion == promotion and squares[move.origin].occupant.kind == kind
+        and (from_file is None or FILE_OF[move.origin] == "abcdefgh".index(from_file))
+        and (from_rank is None or RANK_OF[move.origin] == int(from_rank) - 1)]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def replay_game(game: PgnGame) -> GameReport:
+    """
+    Replays a game from its starting position (the FEN tag, if present), stopping at the first rejected move. Any
+    error while replaying the game is reported as a rejection of that game only.
+    :param game: the game
+    :return: the report of the replay
+    """
+    try:
+        player: Player = load_fen(game.tags.get("FEN", STARTING_FEN))
+    except Exception as error:
+        return GameReport(game.number, 0, "(setup)", 0, f"bad FEN tag: {error}")
+    ply: int = 0
+    san: str = ""
+    try:
+        for ply, san in enumerate(game.moves):
+            move: Optional[Move] = parse_san(player, san)
+            if move is None:
+                return GameReport(game.number, ply, san, ply, to_fen(player))
+            player.apply_move(move)
+            player = player.opponent
+    except Exception as error:
+        # a corrupt game is reported like a rejected move instead of ending a whole import
+        return GameReport(game.number, ply, san, ply, f"error replaying the move: {error!r}")
+    return GameReport(game.number, len(game.moves))
+
+
+def replay_games(games: Iterable[PgnGame], workers: int = 1) -> Iterator[GameReport]:
+    """
+    Replays games, in this process or spread over a process pool. With a pool, reports arrive in completion order.
+    :param games: the games (e.g. from read_games)
+    :param workers: number of processes (1 replays in this process)
+    :return: iterator over the reports
+    """
+    if workers <= 1:
+        for game in games:
+            yield replay_game(game)
+        return
+    games = iter(games)
+    with multiprocessing.Pool(workers) as pool:
+        while True:
+            batch: list[PgnGame] = list(itertools.islice(games, BATCH_SIZE * workers))
+            if not batch:
+                break
+            yield from pool.imap_unordered(replay_game, batch, chunksize=16)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay the games of a PGN file and check every move.")
+    parser.add_argument("path", help="PGN file to read")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes to replay with (default 1)")
+    parser.add_argument("--progress", type=int, default=0, help="print the speed every N games (default never)")
+    args = parser.parse_args()
+
+    games_done: int = 0
+    plies: int = 0
+    rejected: int = 0
+    start: float = time.perf_counter()
+    with open(args.path, encoding="utf-8", errors="replace") as file:
+        for report in replay_games(read_games(file), args.workers):
+            games_done += 1
+            plies += report.plies
+            if report.rejected_move is not None:
+                rejected += 1
+                print(report)
+            if args.progress and games_done % args.progress == 0:
+                elapsed: float = time.perf_counter() - start
+                print(f"{games_done} games  {games_done / elapsed:.0f} games/s")
+    elapsed = time.perf_counter() - start
+
+    games_per_second: float = games_done / elapsed if elapsed > 0 else 0.0
+    print(f"{games_done} games  {plies} plies  {rejected} rejected  {elapsed:.2f}s  {games_per_second:.1f} games/s")
+    sys.exit(1 if rejected else 0)
+
+
+if __name__ == "__main__":
+    main()
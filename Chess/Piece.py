@@ -8,6 +8,10 @@ class Color(Enum):
     def __str__(self) -> str:
         return "White" if self == Color.white else "Black"
 
+# Piece kinds, used to index the per-type bitboards kept by the Board
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+
 def is_valid_rank(origin: 'Square', target: 'Square') -> bool:
     return origin.get_rank() == target.get_rank()
 
@@ -31,6 +35,10 @@ def file_difference(origin: 'Square', target: 'Square') -> int:
 
 
 class Piece(ABC):
+    # fixed attribute layout: no per-instance __dict__, which keeps pieces small and attribute lookups fast
+    __slots__ = ("position", "color", "moved")
+    # one of PAWN, KNIGHT, BISHOP, ROOK, QUEEN or KING, set by each subclass
+    kind: int
 
     def __init__(self, color: Color, position: 'Square' = None):
         """
@@ -39,10 +47,10 @@ class Piece(ABC):
         :param position: the position (Square) of the new Piece
         """
         self.position = None
-        if position is not None:
-            self.set_position(position)
         self.color = color
         self.moved = False
+        if position is not None:
+            self.set_position(position)
 
     @abstractmethod
     def copy(self, position: 'Square') -> 'Piece':
@@ -0,0 +1,99 @@
+"""
+Background engine searches. A SearchHandle runs Engine.search on a copy of the position in a worker thread and posts
+the result to a queue, so a GUI keeps handling events while the engine thinks and only has to poll for the result
+(e.g. with root.after).
+"""
+import queue
+import threading
+from typing import Optional
+from Engine import Engine, SearchResult
+from Move import Move
+
+
+class SearchHandle:
+    def __init__(self, engine: Engine, player: 'Player', max_time: Optional[float] = None,
+                 max_nodes: Optional[int] = None, max_depth: int = 64, ponder_move: Optional[Move] = None):
+        """
+        Starts searching in the background. The position is copied first, so the caller's board may be used (and
+        changed) while the search runs. The engine must not be used for anything else until the search is done or
+        cancelled.
+        :param engine: the engine to search with
+        :param player: the player to move
+        :param max_time: time budget in seconds (None to search until cancelled)
+        :param max_nodes: node budget (None for no limit)
+        :param max_depth: maximum depth to search to
+        :param ponder_move: if given, the move the player is expected to make; the position after it is searched
+                            instead, so the engine thinks on its opponent's time and its transposition table is
+                            already filled if the expected move is played
+        """
+        self.engine: Engine = engine
+        self.ponder_move: Optional[Move] = ponder_move
+        self.results: queue.Queue = queue.Queue()
+        self.stop_event: threading.Event = threading.Event()
+        self.result: Optional[SearchResult] = None
+        self.error: Optional[Exception] = None
+
+        position: 'Player' = player.copy()
+        if ponder_move is not None:
+            position.apply_move(ponder_move)
+            position = position.opponent
+        engine.stop_event = self.stop_event
+        self.thread: threading.Thread = threading.Thread(target=self.run, daemon=True,
+                                                         args=(position, max_time, max_nodes, max_depth))
+        self.thread.start()
+
+    def run(self, position: 'Player', max_time: Optional[float], max_nodes: Optional[int], max_depth: int) -> None:
+        """
+        Runs the search. Called on the worker thread.
+        :param position: the copied position to search
+        :param max_time: time budget in seconds
+        :param max_nodes: node budget
+        :param max_depth: maximum depth to search to
+        """
+        try:
+            outcome = self.engine.search(position, max_time, max_nodes, max_depth)
+        except Exception as error:
+            # the error is handed to the polling thread, which would otherwise wait for a result forever
+            outcome = error
+        # released before the outcome is posted, so that a search started by the poller keeps its own stop event
+        self.engine.stop_event = None
+        self.results.put(outcome)
+
+    def poll(self) -> Optional[SearchResult]:
+        """
+        Returns the result of the search without waiting for it.
+        :return: the search result, or None if the search is still running
+        :raises Exception: the error the search failed with, if it failed
+        """
+        if self.error is not None:
+            raise self.error
+        if self.result is None:
+            try:
+                outcome = self.results.get_nowait()
+            except queue.Empty:
+                return None
+            if isinstance(outcome, Exception):
+                self.error = outcome
+                raise outcome
+            self.result = outcome
+        return self.result
+
+    def is_running(self) -> bool:
+        """
+        Checks whether the search is still running.
+        :return: True until the search has finished or been cancelled
+        """
+        return self.thread.is_alive()
+
+    def cancel(self) -> Optional[SearchResult]:
+        """
+        Stops the search and waits for the worker thread to finish, after which the engine may be used again.
+        :return: the result of the deepest iteration completed before the search stopped, or None if the search
+                 failed
+        """
+        self.stop_event.set()
+        self.thread.join()
+        try:
+            return self.poll()
+        except Exception:
+            return None
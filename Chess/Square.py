@@ -1,13 +1,18 @@
 from typing import Optional
+from Bitboard import SQUARE_NAMES
 from Chess.Piece import Piece, Color
 
 
 class Square:
+    __slots__ = ("rank", "file", "index", "occupant", "board")
 
-    def __init__(self, rank: int, file: int, occupant: 'Piece' = None):
+    def __init__(self, rank: int, file: int, occupant: 'Piece' = None, board: 'Board' = None):
         self.rank = rank    # rank = Row
         self.file = file    # file = Column
+        self.index = rank * 8 + file    # 0-63 index used by the board's bitboards
         self.occupant = occupant
+        # the board that owns this square, notified whenever the occupant changes
+        self.board = board
 
     def copy(self) -> 'Square':
         square_copy = Square(self.rank, self.file)
@@ -26,7 +31,10 @@ class Square:
         return self.file
 
     def set_occupant(self, new_occupant: Piece) -> None:
+        old_occupant = self.occupant
         self.occupant = new_occupant
+        if self.board is not None:
+            self.board.update_masks(self.index, old_occupant, new_occupant)
 
     def is_occupied(self) -> bool:
         return self.occupant is not None
@@ -41,11 +49,7 @@ class Square:
             return self.occupant.get_color()
 
     def identifier(self) -> str:
-        files: list[str] = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
-        ranks: list[str] = ['1', '2', '3', '4', '5', '6', '7', '8']
-        file_id: int = files[self.file]
-        rank_id: int = ranks[self.rank]
-        return f"{file_id}{rank_id}"
+        return SQUARE_NAMES[self.index]
 
     def display(self) -> str:
         return f"{self.get_occupant()}" if self.is_occupied() else ""
@@ -0,0 +1,570 @@
+"""
+Endgame tablebases: the exact result of every position with a given material of at most four pieces (kings
+included), computed by retrograde analysis and stored on disk for the engine to look up instead of searching.
+
+A table covers one material signature, named after the pieces of the stronger side and then those of the weaker one
+(e.g. "KQvK", "KPvK", "KBNvK", "KQvKR"); a position in which black is the stronger side is looked up with the colors
+swapped. Each table is a pair of files:
+    <name>.wdl  win, draw or loss for the side to move, 2 bits per position
+    <name>.dtm  distance to mate in plies, 1 byte per position (saturating at 255; 0 for draws)
+A position is indexed by the side to move, the white king's square and the squares of the other pieces. Mirroring the
+board left to right (and, without pawns, top to bottom) puts the white king on the a-d files (in the a1-d4 quadrant),
+so only those positions are stored. The files are memory-mapped when a table is first probed, so opening a tablebase
+costs nothing and probing reads a few bytes.
+
+Generation starts from the checkmates and works backwards, ply by ply: a position is won if some move reaches a
+position lost for the opponent, and lost once every move reaches a position won for the opponent. Captures and
+promotions leave the table and are looked up in the smaller tables, which are generated first. Castling and en
+passant are not represented (positions with castling rights or a possible en passant capture are not probed), and
+the fifty-move rule is ignored.
+
+Usage (from the Chess directory):
+    python Tablebase.py generate assets/tablebases KQvK KRvK KPvK
+    python Tablebase.py generate assets/tablebases KBNvK KQvKR       (about ten minutes per four-piece table)
+    python Tablebase.py probe assets/tablebases --fen "8/8/8/4k3/8/8/8/KQ6 w - - 0 1"
+"""
+import argparse
+import mmap
+import os
+import time
+from array import array
+from typing import Iterator, Optional
+from Bitboard import KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, bishop_attacks, rook_attacks, queen_attacks, \
+    squares_of
+from Move import Move
+from Chess.Piece import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+
+MAX_PIECES: int = 4
+# results from the point of view of the side to move
+WIN, DRAW, LOSS = 1, 0, -1
+# 2-bit codes of the .wdl files
+DRAW_CODE, WIN_CODE, LOSS_CODE, INVALID_CODE = range(4)
+MAX_DTM: int = 255
+
+PIECE_ORDER: str = "KQRBNP"
+KIND_OF_LETTER: dict[str, int] = {"K": KING, "Q": QUEEN, "R": ROOK, "B": BISHOP, "N": KNIGHT, "P": PAWN}
+LETTER_OF_KIND: dict[int, str] = {kind: letter for letter, kind in KIND_OF_LETTER.items()}
+# rough worth of the pieces, only used to decide which side of a signature is the stronger one
+STRENGTH: dict[int, int] = {PAWN: 1, KNIGHT: 3, BISHOP: 3, ROOK: 5, QUEEN: 9, KING: 0}
+# material with which no position can end in checkmate: always drawn, so it needs no table
+TRIVIAL_DRAWS: set[str] = {"KvK", "KBvK", "KNvK"}
+PROMOTION_KINDS: list[int] = [QUEEN, ROOK, BISHOP, KNIGHT]
+
+
+def side_name(kinds: list[int]) -> str:
+    """
+    Names the pieces of one side, king first (e.g. "KBN").
+    :param kinds: the kinds of the side's pieces
+    :return: the letters of the pieces
+    """
+    return "".join(sorted((LETTER_OF_KIND[kind] for kind in kinds), key=PIECE_ORDER.index))
+
+
+def material_name(white_kinds: list[int], black_kinds: list[int]) -> tuple[str, bool]:
+    """
+    Names the table holding a material signature.
+    :param white_kinds: the kinds of white's pieces
+    :param black_kinds: the kinds of black's pieces
+    :return: (table name, whether the colors must be swapped to look the position up in it)
+    """
+    swap: bool = _strength(black_kinds) > _strength(white_kinds)
+    if swap:
+        white_kinds, black_kinds = black_kinds, white_kinds
+    return f"{side_name(white_kinds)}v{side_name(black_kinds)}", swap
+
+
+def _strength(kinds: list[int]) -> tuple[int, list[int]]:
+    return sum(STRENGTH[kind] for kind in kinds), sorted(kinds, reverse=True)
+
+
+class TableLayout:
+    def __init__(self, name: str):
+        """
+        Constructs the layout of a table: the order of its pieces and the size of its index.
+        :param name: the material signature (e.g. "KBNvK")
+        :raises ValueError: if the name is malformed or has more than MAX_PIECES pieces
+        """
+        sides: list[str] = name.split("v")
+        if (len(sides) != 2 or any(not side or side[0] != "K" or "K" in side[1:] for side in sides) or
+                any(letter not in KIND_OF_LETTER for letter in sides[0] + sides[1])):
+            raise ValueError(f"bad material signature: {name}")
+        if len(sides[0]) + len(sides[1]) > MAX_PIECES:
+            raise ValueError(f"tables have at most {MAX_PIECES} pieces: {name}")
+        self.name: str = name
+        # (color value, kind) of each piece: the white king, the black king, then the others of white and black
+        self.pieces: list[tuple[int, int]] = ([(0, KING), (1, KING)] +
+                                              [(0, KIND_OF_LETTER[letter]) for letter in sides[0][1:]] +
+                                              [(1, KIND_OF_LETTER[letter]) for letter in sides[1][1:]])
+        self.has_pawns: bool = "P" in name
+        # squares of the white king that are stored: the a-d files, or the a1-d4 quadrant without pawns
+        self.king_slots: int = 32 if self.has_pawns else 16
+        self.size: int = 2 * self.king_slots * 64 ** (len(self.pieces) - 1)
+
+    def canonical(self, squares: list[int]) -> list[int]:
+        """
+        Mirrors a position so that the white king is on a stored square.
+        :param squares: the squares of the pieces, in the layout's order
+        :return: the squares of the mirrored position
+        """
+        white_king: int = squares[0]
+        flip: int = 0
+        if white_king & 7 > 3:
+            flip ^= 7
+        if not self.has_pawns and white_king >> 3 > 3:
+            flip ^= 56
+        return [square ^ flip for square in squares] if flip else squares
+
+    def index(self, turn: int, squares: list[int]) -> int:
+        """
+        Computes the index of a position.
+        :param turn: color value of the side to move
+        :param squares: the squares of the pieces, in the layout's order, mirrored by canonical()
+        :return: the index of the position in the table
+        """
+        white_king: int = squares[0]
+        index: int = turn * self.king_slots + (white_king >> 3) * 4 + (white_king & 7)
+        for square in squares[1:]:
+            index = index * 64 + square
+        return index
+
+    def decode(self, index: int) -> tuple[int, list[int]]:
+        """
+        Recovers the position of an index.
+        :param index: the index of the position in the table
+        :return: (color value of the side to move, the squares of the pieces in the layout's order)
+        """
+        squares: list[int] = []
+        for _ in range(len(self.pieces) - 1):
+            index, square = divmod(index, 64)
+            squares.append(square)
+        turn, slot = divmod(index, self.king_slots)
+        squares.append((slot >> 2) * 8 + (slot & 3))
+        squares.reverse()
+        return turn, squares
+
+
+class Tablebase:
+    def __init__(self, directory: str):
+        """
+        Opens a directory of tables. Nothing is read until a table is first probed.
+        :param directory: the directory holding the .wdl and .dtm files
+        """
+        self.directory: str = directory
+        # layout, win/draw/loss codes and distances to mate of each table, None if the table is missing
+        self.tables: dict[str, Optional[tuple[TableLayout, bytes, bytes]]] = {}
+        self.files: list = []
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the table files.
+        """
+        for table in self.tables.values():
+            if table is not None:
+                for buffer in table[1:]:
+                    if isinstance(buffer, mmap.mmap):
+                        buffer.close()
+        for file in self.files:
+            file.close()
+        self.tables.clear()
+        self.files.clear()
+
+    def table(self, name: str) -> Optional[tuple[TableLayout, bytes, bytes]]:
+        """
+        Returns a table, mapping its files the first time it is asked for.
+        :param name: the material signature
+        :return: (layout, win/draw/loss codes, distances to mate), or None if the table's files are missing
+        """
+        if name not in self.tables:
+            table: Optional[tuple[TableLayout, bytes, bytes]] = None
+            wdl_path: str = os.path.join(self.directory, f"{name}.wdl")
+            dtm_path: str = os.path.join(self.directory, f"{name}.dtm")
+            if os.path.exists(wdl_path) and os.path.exists(dtm_path):
+                buffers: list[mmap.mmap] = []
+                for path in (wdl_path, dtm_path):
+                    file = open(path, "rb")
+                    self.files.append(file)
+                    buffers.append(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+                table = (TableLayout(name), buffers[0], buffers[1])
+            self.tables[name] = table
+        return self.tables[name]
+
+    def probe_pieces(self, turn: int, pieces: list[tuple[int, int]], squares: list[int]) -> Optional[tuple[int, int]]:
+        """
+        Looks up a position given as a list of pieces.
+        :param turn: color value of the side to move
+        :param pieces: (color value, kind) of each piece
+        :param squares: the square of each piece
+        :return: (WIN, DRAW or LOSS for the side to move, distance to mate in plies), or None if there is no table
+        """
+        white_kinds: list[int] = [kind for color, kind in pieces if color == 0]
+        black_kinds: list[int] = [kind for color, kind in pieces if color == 1]
+        name, swap = material_name(white_kinds, black_kinds)
+        if name in TRIVIAL_DRAWS:
+            return DRAW, 0
+        table = self.table(name)
+        if table is None:
+            return None
+        layout, wdl, dtm = table
+
+        # put the pieces in the table's order, with the colors swapped and the board turned around if needed
+        flip: int = 56 if swap else 0
+        ordered: list[int] = [-1] * len(layout.pieces)
+        for (color, kind), square in zip(pieces, squares):
+            piece: tuple[int, int] = (color ^ swap, kind)
+            slot: int = next(slot for slot, slot_piece in enumerate(layout.pieces)
+                             if slot_piece == piece and ordered[slot] < 0)
+            ordered[slot] = square ^ flip
+        index: int = layout.index(turn ^ swap, layout.canonical(ordered))
+
+        code: int = wdl[index >> 2] >> (index & 3) * 2 & 3
+        if code == WIN_CODE:
+            return WIN, dtm[index]
+        if code == LOSS_CODE:
+            return LOSS, dtm[index]
+        if code == DRAW_CODE:
+            return DRAW, 0
+        return None
+
+    def probe(self, board: 'Board') -> Optional[tuple[int, int]]:
+        """
+        Looks up the position on a board.
+        :param board: the board
+        :return: (WIN, DRAW or LOSS for the side to move, distance to mate in plies), or None if the position has
+                 too many pieces, castling rights or a possible en passant capture, or its table is missing
+        """
+        if board.castling or board.occupied.bit_count() > MAX_PIECES:
+            return None
+        turn: int = board.turn.value
+        en_passant: Optional[int] = board.en_passant_square
+        if en_passant is not None and PAWN_ATTACKS[1 - turn][en_passant] & board.piece_masks[turn][PAWN]:
+            return None
+        pieces: list[tuple[int, int]] = []
+        squares: list[int] = []
+        for color in (0, 1):
+            for kind in range(6):
+                for square in squares_of(board.piece_masks[color][kind]):
+                    pieces.append((color, kind))
+                    squares.append(square)
+        return self.probe_pieces(turn, pieces, squares)
+
+    def best_move(self, player: 'Player') -> Optional[Move]:
+        """
+        Chooses the move that keeps the best result: the fastest win, a draw, or the slowest loss.
+        :param player: the player to move
+        :return: the move, or None if the position or one of its successors cannot be looked up, or the player has
+                 no legal move
+        """
+        if self.probe(player.board) is None:
+            return None
+        best: Optional[Move] = None
+        best_rank: tuple[int, int] = (-2, 0)
+        for move in player.legal_moves():
+            player.apply_move(move)
+            entry: Optional[tuple[int, int]] = self.probe(player.board)
+            player.unmake_move()
+            if entry is None:
+                return None
+            result, distance = entry
+            # the result after the move is the opponent's; prefer short wins and long losses for the player
+            rank: tuple[int, int] = (-result, -distance if result == LOSS else distance)
+            if rank > best_rank:
+                best, best_rank = move, rank
+        return best
+
+
+def _attacks(kind: int, color: int, square: int, occupied: int) -> int:
+    if kind == PAWN:
+        return PAWN_ATTACKS[color][square]
+    if kind == KNIGHT:
+        return KNIGHT_ATTACKS[square]
+    if kind == BISHOP:
+        return bishop_attacks(square, occupied)
+    if kind == ROOK:
+        return rook_attacks(square, occupied)
+    if kind == QUEEN:
+        return queen_attacks(square, occupied)
+    return KING_ATTACKS[square]
+
+
+def _is_attacked(pieces: list[tuple[int, int]], squares: list[int], target: int, by_color: int,
+                 occupied: int) -> bool:
+    for (color, kind), square in zip(pieces, squares):
+        if color == by_color and _attacks(kind, color, square, occupied) >> target & 1:
+            return True
+    return False
+
+
+def _is_valid(pieces: list[tuple[int, int]], squares: list[int], turn: int) -> bool:
+    occupied: int = 0
+    for (_, kind), square in zip(pieces, squares):
+        if occupied >> square & 1 or (kind == PAWN and (square < 8 or square >= 56)):
+            return False
+        occupied |= 1 << square
+    # the side that has just moved cannot be in check (this also keeps the kings apart)
+    return not _is_attacked(pieces, squares, squares[1 - turn], turn, occupied)
+
+
+def _moves(pieces: list[tuple[int, int]], squares: list[int],
+           turn: int) -> Iterator[tuple[list[tuple[int, int]], list[int], bool]]:
+    """
+    Yields the position after each legal move of the side to move, and whether the move stays in the same table
+    (it is neither a capture nor a promotion). The kings stay first in the piece list, so squares[color] is the
+    square of that color's king.
+    """
+    occupied: int = 0
+    own: int = 0
+    for (color, _), square in zip(pieces, squares):
+        occupied |= 1 << square
+        if color == turn:
+            own |= 1 << square
+    for mover, ((color, kind), origin) in enumerate(zip(pieces, squares)):
+        if color != turn:
+            continue
+        if kind == PAWN:
+            forward: int = 8 if turn == 0 else -8
+            targets: int = PAWN_ATTACKS[turn][origin] & occupied & ~own
+            if not occupied >> origin + forward & 1:
+                targets |= 1 << origin + forward
+                start_rank: int = 1 if turn == 0 else 6
+                if origin >> 3 == start_rank and not occupied >> origin + 2 * forward & 1:
+                    targets |= 1 << origin + 2 * forward
+        else:
+            targets = _attacks(kind, color, origin, occupied) & ~own
+        for target in squares_of(targets):
+            new_pieces: list[tuple[int, int]] = pieces
+            new_squares: list[int] = list(squares)
+            new_squares[mover] = target
+            moved: int = mover
+            if occupied >> target & 1:
+                captured: int = squares.index(target)
+                new_pieces = pieces[:captured] + pieces[captured + 1:]
+                del new_squares[captured]
+                if captured < mover:
+                    moved -= 1
+            new_occupied: int = occupied & ~(1 << origin) | 1 << target
+            if _is_attacked(new_pieces, new_squares, new_squares[turn], 1 - turn, new_occupied):
+                continue
+            if kind == PAWN and (target < 8 or target >= 56):
+                for promotion in PROMOTION_KINDS:
+                    promoted: list[tuple[int, int]] = list(new_pieces)
+                    promoted[moved] = (turn, promotion)
+                    yield promoted, new_squares, False
+            else:
+                yield new_pieces, new_squares, new_pieces is pieces
+
+
+def _unmoves(pieces: list[tuple[int, int]], squares: list[int], turn: int) -> Iterator[list[int]]:
+    """
+    Yields the squares of every position, with the other side to move, from which that side reaches this position
+    by a move that is neither a capture nor a promotion.
+    """
+    mover: int = 1 - turn
+    occupied: int = 0
+    for square in squares:
+        occupied |= 1 << square
+    for moved, ((color, kind), target) in enumerate(zip(pieces, squares)):
+        if color != mover:
+            continue
+        if kind == PAWN:
+            backward: int = -8 if mover == 0 else 8
+            origins: int = 0
+            origin: int = target + backward
+            if 8 <= origin < 56 and not occupied >> origin & 1:
+                origins |= 1 << origin
+                double_push_rank: int = 3 if mover == 0 else 4
+                if target >> 3 == double_push_rank and not occupied >> origin + backward & 1:
+                    origins |= 1 << origin + backward
+        else:
+            origins = _attacks(kind, color, target, occupied) & ~occupied
+        for origin in squares_of(origins):
+            new_squares: list[int] = list(squares)
+            new_squares[moved] = origin
+            # before the move, the side now to move was not to move, so it cannot have been in check
+            if not _is_attacked(pieces, new_squares, new_squares[turn], mover, occupied & ~(1 << target) | 1 << origin):
+                yield new_squares
+
+
+def dependencies(name: str) -> set[str]:
+    """
+    Finds the tables that captures and promotions lead to from a table.
+    :param name: the material signature
+    :return: the names of the smaller tables, without the trivially drawn ones
+    """
+    layout: TableLayout = TableLayout(name)
+    materials: list[list[tuple[int, int]]] = []
+    others: list[int] = list(range(2, len(layout.pieces)))
+    for captured in [None] + others:
+        remaining: list[tuple[int, int]] = [piece for slot, piece in enumerate(layout.pieces) if slot != captured]
+        if captured is not None:
+            materials.append(remaining)
+        for slot, (color, kind) in enumerate(remaining):
+            if kind == PAWN:
+                for promotion in PROMOTION_KINDS:
+                    materials.append(remaining[:slot] + [(color, promotion)] + remaining[slot + 1:])
+    names: set[str] = set()
+    for material in materials:
+        child, _ = material_name([kind for color, kind in material if color == 0],
+                                 [kind for color, kind in material if color == 1])
+        if child not in TRIVIAL_DRAWS and child != name:
+            names.add(child)
+    return names
+
+
+def generate_table(tablebase: Tablebase, name: str) -> None:
+    """
+    Generates one table by retrograde analysis and writes its files to the tablebase's directory. The tables its
+    captures and promotions lead to must already be available.
+    :param tablebase: the tablebase to look the smaller tables up in and to add the new table to
+    :param name: the material signature
+    """
+    layout: TableLayout = TableLayout(name)
+    pieces: list[tuple[int, int]] = layout.pieces
+    size: int = layout.size
+    codes: bytearray = bytearray([INVALID_CODE]) * size
+    distances: array = array("H", bytes(2 * size))
+    # number of moves of each position that stay in the table and are not yet known to lose
+    remaining: bytearray = bytearray(size)
+    winning_exits: set[int] = set()
+    drawing_exits: set[int] = set()
+    losing_exits: dict[int, int] = {}
+    # positions whose result becomes final at each ply, with that result
+    pending: list[list[tuple[int, int]]] = [[]]
+
+    def schedule(index: int, code: int, ply: int) -> None:
+        while len(pending) <= ply:
+            pending.append([])
+        pending[ply].append((index, code))
+
+    for index in range(size):
+        turn, squares = layout.decode(index)
+        if not _is_valid(pieces, squares, turn):
+            continue
+        codes[index] = DRAW_CODE
+        in_table: int = 0
+        has_moves: bool = False
+        win_ply: int = -1
+        loss_ply: int = -1
+        for new_pieces, new_squares, stays in _moves(pieces, squares, turn):
+            has_moves = True
+            if stays:
+                in_table += 1
+                continue
+            entry: Optional[tuple[int, int]] = tablebase.probe_pieces(1 - turn, new_pieces, new_squares)
+            if entry is None:
+                raise ValueError(f"{name} needs a table that is missing from {tablebase.directory}")
+            result, distance = entry
+            if result == LOSS:
+                win_ply = distance + 1 if win_ply < 0 else min(win_ply, distance + 1)
+            elif result == DRAW:
+                drawing_exits.add(index)
+            else:
+                loss_ply = max(loss_ply, distance + 1)
+        remaining[index] = in_table
+        if not has_moves:
+            # checkmate, or stalemate (which stays a draw)
+            if _is_attacked(pieces, squares, squares[turn], 1 - turn, sum(1 << square for square in squares)):
+                schedule(index, LOSS_CODE, 0)
+            continue
+        if win_ply >= 0:
+            winning_exits.add(index)
+            schedule(index, WIN_CODE, win_ply)
+        if loss_ply >= 0:
+            losing_exits[index] = loss_ply
+            if in_table == 0 and win_ply < 0 and index not in drawing_exits:
+                schedule(index, LOSS_CODE, loss_ply)
+
+    ply: int = 0
+    while ply < len(pending):
+        for index, code in pending[ply]:
+            if codes[index] != DRAW_CODE:
+                continue
+            codes[index] = code
+            distances[index] = ply
+            turn, squares = layout.decode(index)
+            for previous_squares in _unmoves(pieces, squares, turn):
+                previous: int = layout.index(1 - turn, layout.canonical(previous_squares))
+                if codes[previous] != DRAW_CODE:
+                    continue
+                if code == LOSS_CODE:
+                    schedule(previous, WIN_CODE, ply + 1)
+                else:
+                    remaining[previous] -= 1
+                    if (remaining[previous] == 0 and previous not in winning_exits and
+                            previous not in drawing_exits):
+                        schedule(previous, LOSS_CODE, max(ply + 1, losing_exits.get(previous, 0)))
+        pending[ply] = []
+        ply += 1
+
+    wdl: bytearray = bytearray((size + 3) // 4)
+    for index in range(size):
+        wdl[index >> 2] |= codes[index] << (index & 3) * 2
+    dtm: bytes = bytes(min(distance, MAX_DTM) for distance in distances)
+    os.makedirs(tablebase.directory, exist_ok=True)
+    with open(os.path.join(tablebase.directory, f"{name}.wdl"), "wb") as file:
+        file.write(wdl)
+    with open(os.path.join(tablebase.directory, f"{name}.dtm"), "wb") as file:
+        file.write(dtm)
+    tablebase.tables[name] = (layout, bytes(wdl), dtm)
+
+
+def generate(directory: str, names: list[str], verbose: bool = True) -> None:
+    """
+    Generates tables, and first the smaller tables they depend on, skipping those already in the directory.
+    :param directory: the directory to write the tables to
+    :param names: the material signatures (e.g. ["KQvK", "KBNvK"])
+    :param verbose: whether to print each table's statistics
+    """
+    tablebase: Tablebase = Tablebase(directory)
+
+    def ensure(name: str) -> None:
+        if name in TRIVIAL_DRAWS or tablebase.table(name) is not None:
+            return
+        for dependency in sorted(dependencies(name)):
+            ensure(dependency)
+        start: float = time.perf_counter()
+        generate_table(tablebase, name)
+        if verbose:
+            layout, wdl, dtm = tablebase.table(name)
+            counts: list[int] = [0] * 4
+            for byte in wdl:
+                for shift in (0, 2, 4, 6):
+                    counts[byte >> shift & 3] += 1
+            # the padding of the last byte reads as draws
+            counts[DRAW_CODE] -= len(wdl) * 4 - layout.size
+            print(f"{name}: {counts[WIN_CODE]} won, {counts[DRAW_CODE]} drawn, {counts[LOSS_CODE]} lost, "
+                  f"longest mate {max(dtm)} plies  {time.perf_counter() - start:.1f}s")
+
+    for name in names:
+        ensure(name)
+    tablebase.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate or probe endgame tablebases.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("generate", help="generate tables (and the smaller ones they need)")
+    build.add_argument("directory", help="directory to write the tables to")
+    build.add_argument("names", nargs="+", help="material signatures, e.g. KQvK KRvK KPvK KBNvK")
+    probe = commands.add_parser("probe", help="look a position up")
+    probe.add_argument("directory", help="directory holding the tables")
+    probe.add_argument("--fen", required=True, help="the position")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate(args.directory, args.names)
+        return
+    from Fen import load_fen
+    tablebase: Tablebase = Tablebase(args.directory)
+    player = load_fen(args.fen)
+    entry: Optional[tuple[int, int]] = tablebase.probe(player.board)
+    if entry is None:
+        print("position not in the tablebase")
+    else:
+        result, distance = entry
+        print({WIN: f"win, mate in {distance} plies", DRAW: "draw", LOSS: f"loss, mated in {distance} plies"}[result])
+        print(f"best move {tablebase.best_move(player)}")
+    tablebase.close()
+
+
+if __name__ == "__main__":
+    main()
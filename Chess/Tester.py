@@ -1,6 +1,6 @@
 from Player import Player
 from Board import Board
-from Chess.Piece import Color
+from Chess.Piece import Color, QUEEN
 
 # def make_move(move, board):
 #     split_input = move.split(" ")
@@ -59,10 +59,8 @@ black.opponent = white
 
 print(board)
 
-white.make_move("a7", "a8")
-
-if white.pawn_promotion():
-    print(board)
+white.make_move("a7", "a8", QUEEN)
+print(board)
 
 for piece in white.pieces:
     print(f"{piece} at {piece.coord_string()}")
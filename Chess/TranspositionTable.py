@@ -0,0 +1,136 @@
+"""
+Fixed-size transposition table keyed by the board's Zobrist key.
+
+The table is one preallocated array of 64-bit words, so its memory use never grows during a session. Entries are
+grouped in buckets of two: the first slot keeps the deepest result (depth-preferred), the second always takes the
+newest result (always-replace).
+
+The table can live in a shared buffer written by several search processes at once. Each entry's first word holds
+key XOR data rather than the key, so an entry torn by two concurrent writes no longer matches its key and is simply
+treated as a miss.
+"""
+from array import array
+from typing import Optional
+
+# bound types
+EXACT: int = 1
+LOWER_BOUND: int = 2
+UPPER_BOUND: int = 3
+
+# each entry is two 64-bit words (key XOR data, data), and each bucket holds two entries
+ENTRY_BYTES: int = 16
+BUCKET_WORDS: int = 4
+
+# data word layout: move (16 bits) | depth (8 bits) | bound (2 bits) | age (6 bits) | score + SCORE_OFFSET (32 bits)
+SCORE_OFFSET: int = 1 << 31
+
+
+class TranspositionTable:
+    def __init__(self, size_mb: int = 16, buffer=None):
+        """
+        Constructs a new TranspositionTable.
+        :param size_mb: size of the table in megabytes
+        :param buffer: optional writable buffer of size_mb megabytes to keep the table in (e.g. shared memory);
+                       by default the table allocates its own memory
+        """
+        self.bucket_count: int = max(1, size_mb * (1 << 20) // (ENTRY_BYTES * 2))
+        word_count: int = self.bucket_count * BUCKET_WORDS
+        if buffer is None:
+            self.words = array('Q', bytes(word_count * 8))
+        else:
+            self.words = memoryview(buffer).cast('B')[:word_count * 8].cast('Q')
+        self.age: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.collisions: int = 0
+
+    def new_search(self) -> None:
+        """
+        Marks the start of a new search, so entries from earlier searches become the first to be replaced.
+        """
+        self.age = (self.age + 1) & 63
+
+    def clear(self) -> None:
+        """
+        Empties the table and resets the counters.
+        """
+        for index in range(len(self.words)):
+            self.words[index] = 0
+        self.age = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def probe(self, key: int) -> Optional[tuple[int, int, int, int]]:
+        """
+        Looks up a position.
+        :param key: Zobrist key of the position
+        :return: (depth, score, bound, move code) if the position is stored, otherwise None
+        """
+        words = self.words
+        base: int = (key % self.bucket_count) * BUCKET_WORDS
+        for slot in (base, base + 2):
+            data: int = words[slot + 1]
+            if words[slot] ^ data == key:
+                if data:
+                    self.hits += 1
+                    return (data >> 16 & 0xFF, (data >> 32) - SCORE_OFFSET, data >> 24 & 3, data & 0xFFFF)
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: int, move_code: int = 0) -> None:
+        """
+        Stores the result of searching a position. The depth-preferred slot is used if it holds the same position,
+        a shallower result or a result from an earlier search; otherwise the always-replace slot is used.
+        :param key: Zobrist key of the position
+        :param depth: depth the position was searched to
+        :param score: score of the position
+        :param bound: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param move_code: best move found, packed with Move.encode() (0 for none)
+        """
+        words = self.words
+        base: int = (key % self.bucket_count) * BUCKET_WORDS
+        depth = max(0, min(depth, 255))
+        data: int = (move_code & 0xFFFF | depth << 16 | bound << 24 | self.age << 26 |
+                     (score + SCORE_OFFSET) << 32)
+
+        stored_data: int = words[base + 1]
+        stored_key: int = words[base] ^ stored_data
+        if (stored_key == key or not stored_data or stored_data >> 16 & 0xFF <= depth or
+                stored_data >> 26 & 63 != self.age):
+            slot: int = base
+        else:
+            slot = base + 2
+            stored_data = words[slot + 1]
+            stored_key = words[slot] ^ stored_data
+        if stored_data and stored_key != key:
+            self.collisions += 1
+        words[slot] = key ^ data
+        words[slot + 1] = data
+
+    def release(self) -> None:
+        """
+        Releases the view of an external buffer, which has to happen before shared memory holding it can be closed.
+        """
+        if isinstance(self.words, memoryview):
+            self.words.release()
+
+    def hashfull(self) -> int:
+        """
+        Estimates how full the table is from a sample of its first buckets.
+        :return: number of used entries per thousand
+        """
+        sample: int = min(self.bucket_count, 500)
+        used: int = 0
+        for bucket in range(sample):
+            base: int = bucket * BUCKET_WORDS
+            used += (self.words[base + 1] != 0) + (self.words[base + 3] != 0)
+        return used * 1000 // (sample * 2)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the table's counters.
+        :return: dictionary with the hits, misses, collisions and hashfull (per mille) of the table
+        """
+        return {"hits": self.hits, "misses": self.misses, "collisions": self.collisions,
+                "hashfull": self.hashfull()}
@@ -0,0 +1,26 @@
+"""
+Zobrist hashing tables. A position's key is the XOR of one random 64-bit number per (color, piece kind, square)
+occupied, plus numbers for the side to move, the castling rights and the en passant file. Moving a piece therefore
+updates the key with a couple of XORs instead of rehashing the board.
+"""
+import random
+
+# fixed seed so that keys are the same in every process and every run (needed for shared tables and books)
+_generator: random.Random = random.Random(0x5EED_C0DE)
+
+# PIECE_KEYS[color value][piece kind][square index]
+PIECE_KEYS: list[list[list[int]]] = [[[_generator.getrandbits(64) for _ in range(64)] for _ in range(6)]
+                                     for _ in range(2)]
+# XORed in when black is to move
+SIDE_KEY: int = _generator.getrandbits(64)
+# indexed by the 4-bit castling rights mask (see the CASTLE_* constants); no rights hash to 0 so that an empty board
+# has key 0
+CASTLING_KEYS: list[int] = [0] + [_generator.getrandbits(64) for _ in range(15)]
+# indexed by the file of the en passant square
+EN_PASSANT_KEYS: list[int] = [_generator.getrandbits(64) for _ in range(8)]
+
+# castling rights bits
+CASTLE_WHITE_KINGSIDE: int = 1
+CASTLE_WHITE_QUEENSIDE: int = 2
+CASTLE_BLACK_KINGSIDE: int = 4
+CASTLE_BLACK_QUEENSIDE: int = 8
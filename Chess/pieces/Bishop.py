@@ -1,7 +1,10 @@
-from Chess.Piece import Piece, Color
+from Chess.Piece import Piece, Color, BISHOP
 
 
 class Bishop(Piece):
+    __slots__ = ()
+    kind: int = BISHOP
+
     def copy(self, position) -> 'Bishop':
         new_bishop: Bishop = Bishop(self.color, position)
         new_bishop.moved = self.moved
@@ -1,7 +1,10 @@
-from Chess.Piece import Piece, Color
+from Chess.Piece import Piece, Color, KING
 
 
 class King(Piece):
+    __slots__ = ()
+    kind: int = KING
+
     def copy(self, position: 'Square') -> 'King':
         """
         Returns a copy of the piece with
@@ -1,7 +1,10 @@
-from Chess.Piece import Piece, Color
+from Chess.Piece import Piece, Color, KNIGHT
 
 
 class Knight(Piece):
+    __slots__ = ()
+    kind: int = KNIGHT
+
     def copy(self, position: 'Square') -> 'Knight':
         new_piece = Knight(self.color, position)
         new_piece.moved = self.moved
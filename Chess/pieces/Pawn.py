@@ -1,16 +1,13 @@
-from Chess.Piece import Piece, Color, is_valid_diagonal, is_valid_file
+from Chess.Piece import Piece, Color, PAWN, is_valid_diagonal, is_valid_file
 
 
 class Pawn(Piece):
-
-    def __init__(self, color, position):
-        self.valid_en_passant_target = False
-        super().__init__(color, position)
+    __slots__ = ()
+    kind: int = PAWN
 
     def copy(self, position: 'Square') -> 'Pawn':
         new_piece: Pawn = Pawn(self.color, position)
         new_piece.moved = self.moved
-        new_piece.valid_en_passant_target = self.valid_en_passant_target
         return new_piece
 
     def value(self) -> int:
@@ -29,29 +26,23 @@ class Pawn(Piece):
             if target.is_occupied():
                 if is_valid_diagonal(origin, target) and origin.get_rank() + 1 == target.get_rank():
                     result = True
-                    self.valid_en_passant_target = False
             # White pawns can always move up one rank (row)
             elif is_valid_file(origin, target) and origin.get_rank() + 1 == target.get_rank():
                 result = True
-                self.valid_en_passant_target = False
             # White pawns can move up two ranks (rows) on first move
             elif is_valid_file(origin, target) and origin.get_rank() + 2 == target.get_rank() and not self.moved:
                 result = True
-                self.valid_en_passant_target = True
         else:
             # Black Pawns capture diagonally down by one rank
             if target.is_occupied():
                 if is_valid_diagonal(origin, target) and origin.get_rank() - 1 == target.get_rank():
                     result = True
-                    self.valid_en_passant_target = False
             # Black pawns can always move down one rank (row)
             elif is_valid_file(origin, target) and origin.get_rank() - 1 == target.get_rank():
                 result = True
-                self.valid_en_passant_target = False
             # Black pawns can move down two ranks (rows) on first move
             elif is_valid_file(origin, target) and origin.get_rank() - 2 == target.get_rank() and not self.moved:
                 result = True
-                self.valid_en_passant_target = True
 
         return result
 
@@ -106,7 +97,6 @@ class Pawn(Piece):
     def en_passant_to(self, target_square: 'Square', target_pawn: 'Pawn') -> None:
         self.move_to(target_square)
         target_pawn.capture()
-        self.valid_en_passant_target = False
 
     def __str__(self) -> str:
         if self.color is Color.white:
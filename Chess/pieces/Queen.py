@@ -1,8 +1,11 @@
 from Square import Square
-from Chess.Piece import Piece, Color, is_valid_file, is_valid_rank, is_valid_diagonal
+from Chess.Piece import Piece, Color, QUEEN, is_valid_file, is_valid_rank, is_valid_diagonal
 
 
 class Queen(Piece):
+    __slots__ = ()
+    kind: int = QUEEN
+
     def copy(self, location: Square):
         new_piece = Queen(self.color, location)
         new_piece.moved = self.moved
@@ -1,7 +1,10 @@
-from Chess.Piece import Piece, Color, is_valid_rank, is_valid_file
+from Chess.Piece import Piece, Color, ROOK, is_valid_rank, is_valid_file
 
 
 class Rook(Piece):
+    __slots__ = ()
+    kind: int = ROOK
+
     def copy(self, location: 'Square'):
         new_piece = Rook(self.color, location)
         new_piece.moved = self.moved